@@ -2,7 +2,7 @@
 Core Google Ads API service with multi-account support
 """
 import logging
-import os
+from functools import lru_cache
 from typing import List, Optional, Dict
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
@@ -17,6 +17,72 @@ from core.models.keyword import Keyword
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=64)
+def _campaigns_query(days: int, limit: int) -> str:
+    """GAQL for get_campaigns, built once per (days, limit)"""
+    return f"""
+                SELECT
+                    campaign.id,
+                    campaign.name,
+                    campaign.status,
+                    metrics.impressions,
+                    metrics.clicks,
+                    metrics.cost_micros,
+                    metrics.conversions
+                FROM campaign
+                WHERE segments.date DURING LAST_{days}_DAYS
+                ORDER BY metrics.cost_micros DESC
+                LIMIT {limit}
+            """
+
+
+@lru_cache(maxsize=256)
+def _keywords_query(days: int, limit: int, campaign_id: Optional[str] = None) -> str:
+    """GAQL for get_keywords, built once per (days, limit, campaign_id)"""
+    campaign_filter = f"AND campaign.id = {campaign_id}" if campaign_id else ""
+    return f"""
+                SELECT
+                    campaign.id,
+                    campaign.name,
+                    ad_group.id,
+                    ad_group.name,
+                    ad_group_criterion.keyword.text,
+                    ad_group_criterion.keyword.match_type,
+                    metrics.impressions,
+                    metrics.clicks,
+                    metrics.cost_micros,
+                    metrics.conversions
+                FROM keyword_view
+                WHERE segments.date DURING LAST_{days}_DAYS {campaign_filter}
+                ORDER BY metrics.cost_micros DESC
+                LIMIT {limit}
+            """
+
+
+@lru_cache(maxsize=64)
+def _summary_query(days: int) -> str:
+    """GAQL for get_account_summary, built once per days value"""
+    return f"""
+                SELECT
+                    customer.id,
+                    customer.descriptive_name,
+                    customer.currency_code,
+                    metrics.impressions,
+                    metrics.clicks,
+                    metrics.cost_micros,
+                    metrics.conversions,
+                    metrics.conversions_value
+                FROM customer
+                WHERE segments.date DURING LAST_{days}_DAYS
+            """
+
+
+# Warm the default (days=30, limit=100) variants at import time
+_campaigns_query(30, 100)
+_keywords_query(30, 100)
+_summary_query(30)
+
+
 class GoogleAdsService:
     """Centralized Google Ads API service that can be configured per-user."""
     
@@ -47,9 +113,10 @@ class GoogleAdsService:
             creds.update({k: v for k, v in user_credentials.items() if v is not None})
 
             # Build client config using project/global settings when available
-            developer_token = creds.get("developer_token") or config.google_ads.developer_token or os.getenv("GOOGLE_ADS_DEVELOPER_TOKEN")
-            client_id = creds.get("client_id") or config.google_ads.client_id or os.getenv("GOOGLE_ADS_CLIENT_ID")
-            client_secret = creds.get("client_secret") or config.google_ads.client_secret or os.getenv("GOOGLE_ADS_CLIENT_SECRET")
+            # (config.google_ads already holds the environment values read at import)
+            developer_token = creds.get("developer_token") or config.google_ads.developer_token
+            client_id = creds.get("client_id") or config.google_ads.client_id
+            client_secret = creds.get("client_secret") or config.google_ads.client_secret
             refresh_token = creds.get("refresh_token")
             access_token = creds.get("access_token")
 
@@ -167,20 +234,7 @@ class GoogleAdsService:
             googleads_service = self.client.get_service("GoogleAdsService")
             formatted_id = self.format_customer_id(customer_id)
             
-            query = f"""
-                SELECT
-                    campaign.id,
-                    campaign.name,
-                    campaign.status,
-                    metrics.impressions,
-                    metrics.clicks,
-                    metrics.cost_micros,
-                    metrics.conversions
-                FROM campaign
-                WHERE segments.date DURING LAST_{days}_DAYS
-                ORDER BY metrics.cost_micros DESC
-                LIMIT {limit}
-            """
+            query = _campaigns_query(days, limit)
             
             response = googleads_service.search(customer_id=formatted_id, query=query)
             
@@ -222,25 +276,7 @@ class GoogleAdsService:
             googleads_service = self.client.get_service("GoogleAdsService")
             formatted_id = self.format_customer_id(customer_id)
             
-            campaign_filter = f"AND campaign.id = {campaign_id}" if campaign_id else ""
-            
-            query = f"""
-                SELECT
-                    campaign.id,
-                    campaign.name,
-                    ad_group.id,
-                    ad_group.name,
-                    ad_group_criterion.keyword.text,
-                    ad_group_criterion.keyword.match_type,
-                    metrics.impressions,
-                    metrics.clicks,
-                    metrics.cost_micros,
-                    metrics.conversions
-                FROM keyword_view
-                WHERE segments.date DURING LAST_{days}_DAYS {campaign_filter}
-                ORDER BY metrics.cost_micros DESC
-                LIMIT {limit}
-            """
+            query = _keywords_query(days, limit, campaign_id)
             
             response = googleads_service.search(customer_id=formatted_id, query=query)
             
@@ -281,19 +317,7 @@ class GoogleAdsService:
             googleads_service = self.client.get_service("GoogleAdsService")
             formatted_id = self.format_customer_id(customer_id)
             
-            query = f"""
-                SELECT
-                    customer.id,
-                    customer.descriptive_name,
-                    customer.currency_code,
-                    metrics.impressions,
-                    metrics.clicks,
-                    metrics.cost_micros,
-                    metrics.conversions,
-                    metrics.conversions_value
-                FROM customer
-                WHERE segments.date DURING LAST_{days}_DAYS
-            """
+            query = _summary_query(days)
             
             response = googleads_service.search(customer_id=formatted_id, query=query)
             
@@ -322,6 +346,89 @@ class GoogleAdsService:
             logger.error(f"Error fetching summary for {customer_id}: {e}")
             raise
     
+    @staticmethod
+    def _enum_member(enum_cls, value: str, field: str):
+        """Look up an enum member by name, rejecting unknown names with the allowed ones"""
+        allowed = [n for n in enum_cls.__members__ if n not in ("UNSPECIFIED", "UNKNOWN")]
+        name = str(value).upper()
+        if name not in allowed:
+            raise ValueError(f"Invalid {field} {value!r}; expected one of: {', '.join(allowed)}")
+        return enum_cls[name]
+    
+    def create_campaign_with_budget(self, customer_id: str, budget_micros: int,
+                                    campaign_spec: dict) -> dict:
+        """
+        Create a campaign budget and a campaign that uses it in a single mutate call
+        
+        The budget is given the temporary resource name ``campaignBudgets/-1`` so the
+        campaign operation can reference it within the same atomic request.
+        
+        Args:
+            customer_id: Google Ads customer ID
+            budget_micros: Daily budget amount in micros
+            campaign_spec: Dict with 'name' and optional 'advertising_channel_type'
+                (default SEARCH), 'status' (default PAUSED), 'budget_name',
+                'start_date' and 'end_date' (YYYYMMDD)
+        
+        Returns:
+            Dictionary with the created budget and campaign resource names
+        """
+        name = campaign_spec.get("name")
+        if not name:
+            raise ValueError("campaign_spec.name is required")
+        enums = self.client.enums
+        channel_type = self._enum_member(
+            enums.AdvertisingChannelTypeEnum,
+            campaign_spec.get("advertising_channel_type", "SEARCH"),
+            "campaign_spec.advertising_channel_type"
+        )
+        status = self._enum_member(
+            enums.CampaignStatusEnum, campaign_spec.get("status", "PAUSED"), "campaign_spec.status"
+        )
+        
+        try:
+            googleads_service = self.client.get_service("GoogleAdsService")
+            formatted_id = self.format_customer_id(customer_id)
+            budget_resource_name = f"customers/{formatted_id}/campaignBudgets/-1"
+            
+            budget_operation = self.client.get_type("MutateOperation")
+            budget = budget_operation.campaign_budget_operation.create
+            budget.resource_name = budget_resource_name
+            budget.name = campaign_spec.get("budget_name") or f"{name} Budget"
+            budget.amount_micros = int(budget_micros)
+            budget.delivery_method = enums.BudgetDeliveryMethodEnum.STANDARD
+            budget.explicitly_shared = False
+            
+            campaign_operation = self.client.get_type("MutateOperation")
+            campaign = campaign_operation.campaign_operation.create
+            campaign.name = name
+            campaign.campaign_budget = budget_resource_name
+            campaign.advertising_channel_type = channel_type
+            campaign.status = status
+            self.client.copy_from(campaign.manual_cpc, self.client.get_type("ManualCpc"))
+            if campaign.advertising_channel_type == enums.AdvertisingChannelTypeEnum.SEARCH:
+                campaign.network_settings.target_google_search = True
+                campaign.network_settings.target_search_network = True
+            if campaign_spec.get("start_date"):
+                campaign.start_date = campaign_spec["start_date"]
+            if campaign_spec.get("end_date"):
+                campaign.end_date = campaign_spec["end_date"]
+            
+            response = googleads_service.mutate(
+                customer_id=formatted_id,
+                mutate_operations=[budget_operation, campaign_operation]
+            )
+            
+            budget_result, campaign_result = response.mutate_operation_responses
+            return {
+                "campaign_budget": budget_result.campaign_budget_result.resource_name,
+                "campaign": campaign_result.campaign_result.resource_name
+            }
+            
+        except GoogleAdsException as e:
+            logger.error(f"Error creating campaign for {customer_id}: {e}")
+            raise
+    
     def run_gaql_query(self, customer_id: str, query: str) -> list:
         """
         Execute a custom GAQL query
@@ -0,0 +1,4 @@
+"""Shared helpers for RyzeAgent Backend"""
+from .serialization import to_dicts
+
+__all__ = ["to_dicts"]
@@ -0,0 +1,82 @@
+"""Conversion of service results to JSON-ready dicts"""
+from collections.abc import Mapping
+from dataclasses import asdict, fields, is_dataclass
+from types import UnionType
+from typing import Any, Callable, Dict, List, Union, get_args, get_origin, get_type_hints
+
+import proto
+from google.protobuf.json_format import MessageToDict
+from google.protobuf.message import Message as ProtoMessage
+
+
+def _as_is(a: Dict) -> Dict:
+    return a
+
+
+def _raw(a: Any) -> Dict:
+    return {"raw": str(a)}
+
+
+def _shallow_dict(a: Any) -> Dict:
+    return a.__dict__.copy()
+
+
+_SCALAR_TYPES = (str, bytes, int, float, bool, type(None))
+_LEAF_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def _is_flat_dataclass(cls: type) -> bool:
+    """True when every field is a scalar (or Optional scalar), so a shallow
+    __dict__ copy gives the same result as asdict() without its recursion"""
+    if "__slots__" in cls.__dict__:
+        return False
+    try:
+        hints = get_type_hints(cls)
+    except Exception:
+        return False
+    for f in fields(cls):
+        hint = hints.get(f.name)
+        members = get_args(hint) if get_origin(hint) in (Union, UnionType) else (hint,)
+        if not _LEAF_TYPES.issuperset(members):
+            return False
+    return True
+
+
+def _pick_converter(sample: Any) -> Callable[[Any], Dict]:
+    """Choose how to convert objects of sample's type to a dict"""
+    if is_dataclass(sample):
+        return _shallow_dict if _is_flat_dataclass(type(sample)) else asdict
+    if isinstance(sample, proto.Message):
+        return type(sample).to_dict
+    if isinstance(sample, ProtoMessage):
+        return MessageToDict
+    if isinstance(sample, dict):
+        return _as_is
+    if isinstance(sample, Mapping):
+        return dict
+    if isinstance(sample, _SCALAR_TYPES) or not hasattr(sample, "__dict__"):
+        return _raw
+    return vars
+
+
+# Converter per concrete type, decided once per class rather than per object
+_CONVERTERS: Dict[type, Callable[[Any], Dict]] = {}
+
+
+def _converter_for(a: Any) -> Callable[[Any], Dict]:
+    fn = _CONVERTERS.get(type(a))
+    if fn is None:
+        fn = _CONVERTERS.setdefault(type(a), _pick_converter(a))
+    return fn
+
+
+def to_dicts(objs: List) -> List[Dict]:
+    """Convert service result objects (dataclasses, protos, mappings) to dicts"""
+    if not objs:
+        return []
+
+    # API results are homogeneous: pick the converter once and let map() run the loop in C
+    if len(set(map(type, objs))) == 1:
+        return list(map(_converter_for(objs[0]), objs))
+
+    return [_converter_for(a)(a) for a in objs]
@@ -4,7 +4,7 @@ Using SQLite for simplicity - can be upgraded to PostgreSQL later
 """
 import sqlite3
 import logging
-from typing import Optional, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 from datetime import datetime
 import threading
 
@@ -13,29 +13,72 @@ logger = logging.getLogger(__name__)
 # Thread-local storage for database connections
 _local = threading.local()
 
+# WAL + synchronous=NORMAL turns most commits into a WAL append with no fsync;
+# the busy timeout lets the per-thread connections wait on each other's writes
+_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-64000;
+    PRAGMA busy_timeout=5000;
+"""
+
 def get_connection():
     """Get thread-local database connection"""
     if not hasattr(_local, 'conn'):
-        _local.conn = sqlite3.connect('users.db', check_same_thread=False)
+        # Connections live for the thread's lifetime, so the statement cache
+        # keeps every query here prepared after its first use
+        conn = sqlite3.connect('users.db', check_same_thread=False, cached_statements=256)
+        conn.executescript(_PRAGMAS)
+        _local.conn = conn
     return _local.conn
 
 
+# Every lookup is by google_user_id, so the table is clustered on it
+# (WITHOUT ROWID): a point lookup is one B-tree probe instead of two
+_USERS_COLUMNS = "google_user_id, email, name, access_token, refresh_token, token_expiry, created_at, updated_at"
+_USERS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        google_user_id TEXT PRIMARY KEY,
+        email TEXT NOT NULL,
+        name TEXT,
+        access_token TEXT NOT NULL,
+        refresh_token TEXT,
+        token_expiry TIMESTAMP,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    ) WITHOUT ROWID
+'''
+
+
 def init_db():
     """Initialize the database with required tables"""
     conn = get_connection()
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            google_user_id TEXT PRIMARY KEY,
-            email TEXT NOT NULL,
-            name TEXT,
-            access_token TEXT NOT NULL,
-            refresh_token TEXT,
-            token_expiry TIMESTAMP,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    conn.commit()
+    # IMMEDIATE takes the write lock up front, so concurrently starting workers
+    # check and migrate the schema one at a time
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'users'"
+        ).fetchone()
+
+        if row is None:
+            conn.execute(_USERS_SCHEMA.format(table="users"))
+        elif "WITHOUT ROWID" not in row[0].upper():
+            # One-shot migration of databases created with the old rowid table
+            conn.execute(_USERS_SCHEMA.format(table="users_new"))
+            conn.execute(
+                f"INSERT INTO users_new ({_USERS_COLUMNS}) SELECT {_USERS_COLUMNS} FROM users"
+            )
+            conn.execute("DROP TABLE users")
+            conn.execute("ALTER TABLE users_new RENAME TO users")
+            logger.info("✅ Migrated users table to WITHOUT ROWID")
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
     logger.info("✅ Database initialized")
 
 
@@ -44,7 +87,8 @@ def save_user(
     email: str,
     access_token: str,
     refresh_token: Optional[str] = None,
-    name: Optional[str] = None
+    name: Optional[str] = None,
+    token_expiry: Optional[float] = None
 ) -> None:
     """
     Save or update user OAuth tokens
@@ -55,25 +99,27 @@ def save_user(
         access_token: OAuth access token
         refresh_token: OAuth refresh token (optional)
         name: User's display name (optional)
+        token_expiry: Access token expiry as a Unix timestamp (optional)
     """
     conn = get_connection()
     try:
         conn.execute('''
             INSERT OR REPLACE INTO users 
-            (google_user_id, email, name, access_token, refresh_token, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?)
+            (google_user_id, email, name, access_token, refresh_token, token_expiry, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
         ''', (
             google_user_id,
             email,
             name,
             access_token,
             refresh_token,
+            token_expiry,
             datetime.utcnow()
         ))
         conn.commit()
-        logger.info(f"✅ Saved tokens for user: {email}")
+        logger.info("✅ Saved tokens for user: %s", email)
     except Exception as e:
-        logger.error(f"❌ Failed to save user: {e}")
+        logger.error("❌ Failed to save user: %s", e)
         raise
 
 
@@ -95,16 +141,77 @@ def get_user_tokens(google_user_id: str) -> Tuple[Optional[str], Optional[str]]:
         )
         row = cursor.fetchone()
         if row:
-            logger.info(f"✅ Retrieved tokens for user: {google_user_id}")
+            logger.info("✅ Retrieved tokens for user: %s", google_user_id)
             return row[0], row[1]
         else:
-            logger.warning(f"⚠️  No tokens found for user: {google_user_id}")
+            logger.warning("⚠️  No tokens found for user: %s", google_user_id)
             return None, None
     except Exception as e:
-        logger.error(f"❌ Failed to get user tokens: {e}")
+        logger.error("❌ Failed to get user tokens: %s", e)
         return None, None
 
 
+def get_user_token_record(google_user_id: str) -> Tuple[Optional[str], Optional[str], Optional[float]]:
+    """
+    Get user's OAuth tokens together with the access token's expiry
+    
+    Args:
+        google_user_id: Google user ID
+        
+    Returns:
+        Tuple of (access_token, refresh_token, token_expiry) or (None, None, None) if not found
+    """
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            'SELECT access_token, refresh_token, token_expiry FROM users WHERE google_user_id = ?',
+            (google_user_id,)
+        ).fetchone()
+        if row:
+            return row[0], row[1], row[2]
+        logger.warning("⚠️  No tokens found for user: %s", google_user_id)
+        return None, None, None
+    except Exception as e:
+        logger.error("❌ Failed to get user tokens: %s", e)
+        return None, None, None
+
+
+# Stay well under SQLITE_MAX_VARIABLE_NUMBER (999 on older builds)
+_IN_CHUNK = 500
+
+
+def get_user_token_records(
+    google_user_ids: Iterable[str]
+) -> Dict[str, Tuple[Optional[str], Optional[str], Optional[float]]]:
+    """
+    Get tokens for several users in one query (per 500 ids)
+    
+    Args:
+        google_user_ids: Google user IDs
+        
+    Returns:
+        Dict of google_user_id -> (access_token, refresh_token, token_expiry);
+        unknown users (and any not read because of a database error) are left out
+    """
+    ids = list(google_user_ids)
+    conn = get_connection()
+    records = {}
+    try:
+        for start in range(0, len(ids), _IN_CHUNK):
+            chunk = ids[start:start + _IN_CHUNK]
+            rows = conn.execute(
+                'SELECT google_user_id, access_token, refresh_token, token_expiry FROM users '
+                f'WHERE google_user_id IN ({",".join("?" * len(chunk))})',
+                chunk
+            )
+            for row in rows:
+                records[row[0]] = (row[1], row[2], row[3])
+    except Exception as e:
+        # Like the single-user lookups: users not read are treated as not found
+        logger.error("❌ Failed to get user tokens: %s", e)
+    return records
+
+
 def get_user_info(google_user_id: str) -> Optional[dict]:
     """
     Get user information from database
@@ -131,11 +238,16 @@ def get_user_info(google_user_id: str) -> Optional[dict]:
             }
         return None
     except Exception as e:
-        logger.error(f"❌ Failed to get user info: {e}")
+        logger.error("❌ Failed to get user info: %s", e)
         return None
 
 
-def update_tokens(google_user_id: str, access_token: str, refresh_token: Optional[str] = None) -> None:
+def update_tokens(
+    google_user_id: str,
+    access_token: str,
+    refresh_token: Optional[str] = None,
+    token_expiry: Optional[float] = None
+) -> None:
     """
     Update user's tokens (for token refresh)
     
@@ -143,25 +255,26 @@ def update_tokens(google_user_id: str, access_token: str, refresh_token: Optiona
         google_user_id: Google user ID
         access_token: New access token
         refresh_token: New refresh token (optional)
+        token_expiry: New access token expiry as a Unix timestamp (optional)
     """
     conn = get_connection()
     try:
         if refresh_token:
             conn.execute('''
                 UPDATE users 
-                SET access_token = ?, refresh_token = ?, updated_at = ?
+                SET access_token = ?, refresh_token = ?, token_expiry = ?, updated_at = ?
                 WHERE google_user_id = ?
-            ''', (access_token, refresh_token, datetime.utcnow(), google_user_id))
+            ''', (access_token, refresh_token, token_expiry, datetime.utcnow(), google_user_id))
         else:
             conn.execute('''
                 UPDATE users 
-                SET access_token = ?, updated_at = ?
+                SET access_token = ?, token_expiry = ?, updated_at = ?
                 WHERE google_user_id = ?
-            ''', (access_token, datetime.utcnow(), google_user_id))
+            ''', (access_token, token_expiry, datetime.utcnow(), google_user_id))
         conn.commit()
-        logger.info(f"✅ Updated tokens for user: {google_user_id}")
+        logger.info("✅ Updated tokens for user: %s", google_user_id)
     except Exception as e:
-        logger.error(f"❌ Failed to update tokens: {e}")
+        logger.error("❌ Failed to update tokens: %s", e)
         raise
 
 
@@ -183,13 +296,13 @@ def delete_user(google_user_id: str) -> bool:
         )
         conn.commit()
         if cursor.rowcount > 0:
-            logger.info(f"✅ Deleted user: {google_user_id}")
+            logger.info("✅ Deleted user: %s", google_user_id)
             return True
         else:
-            logger.warning(f"⚠️  User not found: {google_user_id}")
+            logger.warning("⚠️  User not found: %s", google_user_id)
             return False
     except Exception as e:
-        logger.error(f"❌ Failed to delete user: {e}")
+        logger.error("❌ Failed to delete user: %s", e)
         return False
 
 
@@ -216,5 +329,5 @@ def list_users() -> list:
             for row in rows
         ]
     except Exception as e:
-        logger.error(f"❌ Failed to list users: {e}")
+        logger.error("❌ Failed to list users: %s", e)
         return []
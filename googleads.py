@@ -5,15 +5,19 @@ Uses FastMCP's OAuthProxy for automatic OAuth discovery and token handling.
 
 import os
 import logging
-from typing import List, Dict
-from dataclasses import is_dataclass, asdict
+from functools import lru_cache
+from typing import List, Dict, Optional
+from dataclasses import dataclass
 from types import SimpleNamespace
 
 from fastmcp import FastMCP
+from fastmcp.server.auth import StaticTokenVerifier
 from fastmcp.server.auth.oauth_proxy import OAuthProxy
 from google.cloud import secretmanager
 from google.api_core.exceptions import NotFound
 
+from core.utils import to_dicts
+
 try:
     from core.services.google_ads_service import GoogleAdsService
 except Exception as e:
@@ -29,19 +33,38 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # --------------------------------------------------------------------
-# OAuth Proxy Setup (for Claude's automatic OAuth discovery)
+# Config (environment is read once, at import)
 # --------------------------------------------------------------------
-GOOGLE_OAUTH_CLIENT_ID = os.getenv("GOOGLE_OAUTH_CLIENT_ID") or os.getenv("GOOGLE_ADS_CLIENT_ID")
-GOOGLE_OAUTH_CLIENT_SECRET = os.getenv("GOOGLE_OAUTH_CLIENT_SECRET") or os.getenv("GOOGLE_ADS_CLIENT_SECRET")
+@dataclass(frozen=True, slots=True)
+class Config:
+    client_id: Optional[str]
+    client_secret: Optional[str]
+    dev_token: Optional[str]
+    public_base: str
+    port: int
+    host: str
+
+
+CFG = Config(
+    client_id=os.getenv("GOOGLE_OAUTH_CLIENT_ID") or os.getenv("GOOGLE_ADS_CLIENT_ID"),
+    client_secret=os.getenv("GOOGLE_OAUTH_CLIENT_SECRET") or os.getenv("GOOGLE_ADS_CLIENT_SECRET"),
+    dev_token=os.getenv("GOOGLE_ADS_DEVELOPER_TOKEN"),
+    public_base=(
+        os.getenv("RENDER_EXTERNAL_URL") or os.getenv("PUBLIC_URL") or "https://digital-magenta-bee.fastmcp.app"
+    ).rstrip("/"),
+    port=int(os.getenv("PORT", "7070")),
+    host=os.getenv("HOST", "0.0.0.0"),
+)
 
-if not GOOGLE_OAUTH_CLIENT_ID or not GOOGLE_OAUTH_CLIENT_SECRET:
+# --------------------------------------------------------------------
+# OAuth Proxy Setup (for Claude's automatic OAuth discovery)
+# --------------------------------------------------------------------
+if not CFG.client_id or not CFG.client_secret:
     logger.warning("⚠️  Missing GOOGLE_OAUTH_CLIENT_ID/SECRET - OAuth will be disabled")
     oauth = None
 else:
     def build_oauth_proxy():
         """Build OAuthProxy for Google OAuth with Google Ads scope"""
-        from fastmcp.server.auth import StaticTokenVerifier
-        
         auth_url = "https://accounts.google.com/o/oauth2/v2/auth"
         token_url = "https://oauth2.googleapis.com/token"
         scopes = [
@@ -54,16 +77,13 @@ else:
         # Token verifier (FastMCP requires this)
         verifier = StaticTokenVerifier(secret="dummy", required_scopes=scopes)
         
-        public_base = os.getenv("RENDER_EXTERNAL_URL") or os.getenv("PUBLIC_URL") or "https://digital-magenta-bee.fastmcp.app"
-        public_base = public_base.rstrip("/")
-        
         return OAuthProxy(
             upstream_authorization_endpoint=auth_url,
             upstream_token_endpoint=token_url,
-            upstream_client_id=GOOGLE_OAUTH_CLIENT_ID,
-            upstream_client_secret=GOOGLE_OAUTH_CLIENT_SECRET,
+            upstream_client_id=CFG.client_id,
+            upstream_client_secret=CFG.client_secret,
             token_verifier=verifier,
-            base_url=public_base,
+            base_url=CFG.public_base,
         )
     
     try:
@@ -82,6 +102,15 @@ mcp = FastMCP("Google Ads MCP")
 # --------------------------------------------------------------------
 # Helpers
 # --------------------------------------------------------------------
+_AUTH_KEYS = ("refresh_token", "access_token", "secret_version_name")
+
+
+@lru_cache(maxsize=256)
+def _token_creds(key: str, token: str) -> dict:
+    """Build (once per distinct token) the credentials dict for a direct token."""
+    return {key: token}
+
+
 def _resolve_creds(auth: dict) -> dict:
     """
     Accepts one of:
@@ -89,26 +118,30 @@ def _resolve_creds(auth: dict) -> dict:
       {"access_token": "..."} |
       {"secret_version_name": "projects/<id>/secrets/<name>/versions/<n|latest>"}
     Returns a dict suitable for GoogleAdsService(user_credentials=...).
+    The returned dict may be shared between calls and must not be mutated.
     """
     if not isinstance(auth, dict):
         raise ValueError("auth must be an object")
 
-    if "refresh_token" in auth:
-        return {"refresh_token": auth["refresh_token"]}
-
-    if "access_token" in auth:
-        return {"access_token": auth["access_token"]}
+    key = next((k for k in _AUTH_KEYS if k in auth), None)
 
+    match key:
+        case "refresh_token" | "access_token":
+            token = auth[key]
+            if isinstance(token, str):
+                return _token_creds(key, token)
+            return {key: token}
 
-    if "secret_version_name" in auth:
-        name = auth["secret_version_name"]
-        client = secretmanager.SecretManagerServiceClient()
-        try:
-            resp = client.access_secret_version(request={"name": name})
-        except NotFound as e:
-            raise FileNotFoundError(f"Secret version not found: {name}") from e
-        token = resp.payload.data.decode("utf-8")
-        return {"refresh_token": token}
+        case "secret_version_name":
+            name = auth["secret_version_name"]
+            client = secretmanager.SecretManagerServiceClient()
+            try:
+                resp = client.access_secret_version(request={"name": name})
+            except NotFound as e:
+                raise FileNotFoundError(f"Secret version not found: {name}") from e
+            # OAuth refresh tokens are plain ASCII; skip the UTF-8 decoder
+            token = resp.payload.data.decode("ascii")
+            return {"refresh_token": token}
 
     raise ValueError(
         "auth must include one of: refresh_token | access_token | secret_version_name"
@@ -128,39 +161,7 @@ def list_accessible_accounts(auth: dict) -> List[Dict]:
       {"secret_version_name": "projects/<id>/secrets/<name>/versions/<n|latest>"}
     """
     svc = GoogleAdsService(user_credentials=_resolve_creds(auth))
-    accounts = svc.get_accessible_accounts()
-
-    out = []
-    for a in accounts:
-        # dataclass -> asdict
-        try:
-            if is_dataclass(a):
-                out.append(asdict(a))
-                continue
-        except Exception:
-            pass
-
-        # plain object with __dict__
-        if hasattr(a, "__dict__"):
-            try:
-                out.append(vars(a))
-                continue
-            except Exception:
-                pass
-
-        # already a mapping
-        if isinstance(a, dict):
-            out.append(a)
-            continue
-
-        # try to coerce to dict (may raise TypeError)
-        try:
-            out.append(dict(a))
-            continue
-        except Exception:
-            out.append({"raw": str(a)})
-
-    return out
+    return to_dicts(svc.get_accessible_accounts())
 
 
 @mcp.tool
@@ -177,6 +178,21 @@ def get_account_summary(auth: dict, customer_id: str, days: int = 30) -> Dict:
     return data or {"message": f"No data found for account {customer_id}"}
 
 
+@mcp.tool
+def create_campaign_with_budget(auth: dict, customer_id: str, budget_micros: int, campaign_spec: dict) -> Dict:
+    """Create a campaign and its daily budget in one atomic request.
+
+    Args:
+      auth: same formats as list_accessible_accounts
+      customer_id: Google Ads customer ID (with or without dashes)
+      budget_micros: daily budget in micros (1_000_000 = 1 unit of account currency)
+      campaign_spec: {"name": "...", "advertising_channel_type": "SEARCH",
+                      "status": "PAUSED", "start_date": "YYYYMMDD", "end_date": "YYYYMMDD"}
+    """
+    svc = GoogleAdsService(user_credentials=_resolve_creds(auth))
+    return svc.create_campaign_with_budget(customer_id, budget_micros, campaign_spec)
+
+
 # --------------------------------------------------------------------
 # Resources (optional, like your echo resources)
 # --------------------------------------------------------------------
@@ -187,6 +203,7 @@ def help_resource() -> str:
         "Tools:\n"
         " • list_accessible_accounts(auth)\n"
         " • get_account_summary(auth, customer_id, days=30)\n"
+        " • create_campaign_with_budget(auth, customer_id, budget_micros, campaign_spec)\n"
         "\n"
         "auth may be one of:\n"
         "  {\"refresh_token\":\"...\"} | {\"access_token\":\"...\"} | "
@@ -217,8 +234,8 @@ def ads_instructions(text: str = "Provide Google Ads auth and optional customer_
 if __name__ == "__main__":
     import asyncio
     
-    port = int(os.getenv("PORT", "7070"))
-    host = os.getenv("HOST", "0.0.0.0")
+    port = CFG.port
+    host = CFG.host
     
     # Get the HTTP app and add OAuth routes
     app = mcp.http_app()
@@ -243,9 +260,9 @@ OAuth Discovery: {'✅ Enabled' if oauth else '❌ Disabled (missing credentials
   - No manual configuration needed!
 
 Environment Variables:
-  GOOGLE_OAUTH_CLIENT_ID: {'✅ Set' if GOOGLE_OAUTH_CLIENT_ID else '❌ Missing'}
-  GOOGLE_OAUTH_CLIENT_SECRET: {'✅ Set' if GOOGLE_OAUTH_CLIENT_SECRET else '❌ Missing'}
-  GOOGLE_ADS_DEVELOPER_TOKEN: {'✅ Set' if os.getenv('GOOGLE_ADS_DEVELOPER_TOKEN') else '❌ Missing'}
+  GOOGLE_OAUTH_CLIENT_ID: {'✅ Set' if CFG.client_id else '❌ Missing'}
+  GOOGLE_OAUTH_CLIENT_SECRET: {'✅ Set' if CFG.client_secret else '❌ Missing'}
+  GOOGLE_ADS_DEVELOPER_TOKEN: {'✅ Set' if CFG.dev_token else '❌ Missing'}
 
 Press Ctrl+C to stop
 """)
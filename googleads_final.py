@@ -9,18 +9,35 @@ Key changes:
 """
 
 import os
+import asyncio
+import hashlib
+import html
 import logging
-from typing import List, Dict, Optional
-from dataclasses import is_dataclass, asdict
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from operator import attrgetter
+from contextlib import asynccontextmanager, contextmanager
+import httpx
+import orjson
+from cachetools import TTLCache
+from types import MappingProxyType
+from urllib.parse import urlencode
+from typing import Any, Awaitable, Callable, List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 
 from fastmcp import FastMCP
 from fastapi import Request, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse, Response
+from starlette.middleware.gzip import GZipMiddleware
 from starlette.middleware.sessions import SessionMiddleware
+from google.ads.googleads.errors import GoogleAdsException
+from google.auth.exceptions import RefreshError
 
 # Import database functions
 import database as db
+from core.utils import to_dicts
 
 # Load environment variables from .env file
 load_dotenv()
@@ -75,15 +92,41 @@ except ImportError:
 from fastapi import FastAPI
 from starlette.routing import Route
 
-# Initialize database
-db.init_db()
+# SQLite calls run on a small dedicated pool (one thread-local connection per
+# thread) so they never block the event loop or compete with Google Ads calls
+_DB_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="db")
+
+
+async def _run_db(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking database call on the DB thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_DB_EXECUTOR, partial(fn, *args, **kwargs))
 
 # Create FastAPI app separately
-app = FastAPI(title="Google Ads MCP with OAuth")
+app = FastAPI(title="Google Ads MCP with OAuth", default_response_class=ORJSONResponse)
+
+
+class _ScopedSessionMiddleware(SessionMiddleware):
+    """SessionMiddleware that skips routes which never touch request.session.
+
+    MCP traffic, probes and the static pages would otherwise pay for verifying
+    (and re-signing) the session cookie on every request."""
+
+    _SKIP_PATHS = frozenset({"/", "/healthz", "/oauth/login", "/test-auth", "/old-test-auth", "/verify-token"})
+    _SKIP_PREFIXES = ("/mcp", "/.well-known/")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            path = scope["path"]
+            if path in self._SKIP_PATHS or path.startswith(self._SKIP_PREFIXES):
+                await self.app(scope, receive, send)
+                return
+        await super().__call__(scope, receive, send)
+
 
 # Add session middleware (LIKE MARBLE!)
 app.add_middleware(
-    SessionMiddleware,
+    _ScopedSessionMiddleware,
     secret_key=SESSION_SECRET,
     session_cookie="google_ads_mcp_session",
     max_age=30 * 24 * 60 * 60,  # 30 days
@@ -91,57 +134,228 @@ app.add_middleware(
     https_only=False  # Set to True in production with HTTPS
 )
 
+
+class _PageGZipMiddleware(GZipMiddleware):
+    """GZip for the HTML/JSON pages; MCP streams must not be buffered"""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith("/mcp"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+app.add_middleware(_PageGZipMiddleware, minimum_size=1024, compresslevel=5)
+
+def _tool_serializer(data: Any) -> str:
+    """Serialize tool results with orjson (row lists can run to thousands of dicts)"""
+    return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Create FastMCP instance
-mcp = FastMCP("Google Ads MCP")
+mcp = FastMCP("Google Ads MCP", tool_serializer=_tool_serializer)
+
+# Shared HTTP client for Google OAuth endpoints (keep-alive across callbacks and token refreshes)
+HTTPX_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def _http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it if the startup hook has not run
+    (e.g. when the app is served without lifespan events)"""
+    global HTTPX_CLIENT
+    if HTTPX_CLIENT is None:
+        HTTPX_CLIENT = httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            # Refreshes for a user are ~an hour apart; keep idle TLS connections
+            # to Google around longer than httpx's 5s default
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=300),
+            http2=True,
+        )
+    return HTTPX_CLIENT
+
+
+@app.on_event("startup")
+async def _open_http_client():
+    _http_client()
+
+
+@app.on_event("shutdown")
+async def _close_http_client():
+    if HTTPX_CLIENT is not None:
+        await HTTPX_CLIENT.aclose()
+
+
+@app.on_event("startup")
+async def _init_db():
+    # Done per worker at start-up rather than at import, and on a DB thread so
+    # the main thread never opens a connection it would not use again
+    await _run_db(db.init_db)
+
+
+# Static pages are fixed for the process lifetime; an ETag lets browsers and the
+# fronting proxy revalidate with a bodyless 304 instead of re-downloading them.
+_STATIC_CACHE_CONTROL = "public, max-age=60"
+# Pages chosen by session state may change with the next login/logout, so they
+# are only ever revalidated (the handler still runs and can switch pages)
+_SESSION_PAGE_CACHE_CONTROL = "private, no-cache"
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.md5(body).hexdigest()}"'
+
+
+class _StaticPage:
+    """Body, ETag and headers rendered once at import.
+
+    Each request still gets its own Response: middleware (gzip, sessions)
+    edits the outgoing headers in place, so a shared instance would carry one
+    request's Content-Encoding or Set-Cookie into every later one."""
+
+    def __init__(self, body: bytes, media_type: str, cache_control: str = _STATIC_CACHE_CONTROL):
+        self.body = body
+        self.media_type = media_type
+        self.etag = _etag(body)
+        self.headers = {"ETag": self.etag, "Cache-Control": cache_control}
+
+    def for_request(self, request: Request) -> Response:
+        if request.headers.get("if-none-match") == self.etag:
+            return Response(status_code=304, headers=dict(self.headers))
+        return Response(self.body, media_type=self.media_type, headers=dict(self.headers))
 
 # Configure OAuth in FastMCP
 # This is the KEY part that was missing!
+OAUTH_REDIRECT_URI = f"{PUBLIC_BASE}/oauth/callback"
+
+# Google OAuth endpoints
+_GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
+_GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
+_GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
+
+_OAUTH_SCOPES = [
+    "https://www.googleapis.com/auth/adwords",
+    "openid",
+    "https://www.googleapis.com/auth/userinfo.email",
+    "https://www.googleapis.com/auth/userinfo.profile",
+]
+
+# Every parameter is fixed for the process lifetime, so the redirect URL is built once
+_AUTH_REDIRECT_URL = f"{_GOOGLE_AUTH_URL}?" + urlencode({
+    "client_id": GOOGLE_OAUTH_CLIENT_ID,
+    "redirect_uri": OAUTH_REDIRECT_URI,
+    "response_type": "code",
+    "scope": " ".join(_OAUTH_SCOPES),
+    "access_type": "offline",  # Get refresh token
+    "prompt": "consent",  # Force consent to get refresh token
+})
+
+
 @app.get("/oauth/login")
 async def oauth_login(request: Request):
     """Initiate OAuth flow"""
-    from urllib.parse import urlencode
-    
-    # Google OAuth endpoint
-    auth_url = "https://accounts.google.com/o/oauth2/v2/auth"
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("🔐 Redirecting to Google OAuth: %s", _AUTH_REDIRECT_URL)
     
-    scopes = [
-        "https://www.googleapis.com/auth/adwords",
-        "openid",
-        "https://www.googleapis.com/auth/userinfo.email",
-        "https://www.googleapis.com/auth/userinfo.profile",
-    ]
-    
-    params = {
-        "client_id": GOOGLE_OAUTH_CLIENT_ID,
-        "redirect_uri": f"{PUBLIC_BASE}/oauth/callback",
-        "response_type": "code",
-        "scope": " ".join(scopes),
-        "access_type": "offline",  # Get refresh token
-        "prompt": "consent",  # Force consent to get refresh token
-    }
-    
-    redirect_url = f"{auth_url}?{urlencode(params)}"
-    logger.info(f"🔐 Redirecting to Google OAuth: {redirect_url}")
-    
-    return RedirectResponse(url=redirect_url)
+    # A new response each time: middleware edits outgoing headers in place
+    return RedirectResponse(url=_AUTH_REDIRECT_URL, status_code=307)
+
+
+_NO_CODE_HTML: bytes = b"""
+            <html>
+                <body>
+                    <h2>Authentication Failed</h2>
+                    <p>No authorization code received</p>
+                    <a href="/oauth/login">Try Again</a>
+                </body>
+            </html>
+        """
+
+
+# Success page for /oauth/callback: static segments are prebuilt bytes and only
+# the (escaped) user fields and tokens are formatted per login
+_CALLBACK_HEAD: bytes = """
+            <html>
+                <head>
+                    <style>
+                        body { font-family: Arial, sans-serif; margin: 40px; }
+                        .success { color: green; }
+                        .token { 
+                            background: #f4f4f4; 
+                            padding: 10px; 
+                            border-radius: 5px;
+                            word-break: break-all;
+                            font-family: monospace;
+                            font-size: 12px;
+                        }
+                    </style>
+                </head>
+                <body>
+                    <h2 class="success">✅ Authentication Successful!</h2>
+""".encode("utf-8")
+
+_CALLBACK_USER_BLOCK = """                    <p><strong>Email:</strong> {email}</p>
+                    <p><strong>User ID:</strong> {user_id}</p>
+"""
+
+_CALLBACK_MIDDLE: bytes = """                    
+                    <div style="background: #e8f5e9; padding: 20px; border-radius: 8px; margin: 20px 0;">
+                        <h3 style="color: #2e7d32; margin-top: 0;">🎉 Session Saved! (Just Like Marble)</h3>
+                        <p>Your tokens are now stored securely in the database and your session is active!</p>
+                        <p><strong>You don't need to copy or save any tokens manually!</strong></p>
+                    </div>
+                    
+                    <h3>What This Means:</h3>
+                    <ul>
+                        <li>✅ Your tokens are stored in the database</li>
+                        <li>✅ Your session is active on this device</li>
+                        <li>✅ All MCP tools will work automatically (no manual token passing!)</li>
+                        <li>✅ Works across multiple devices with the same login</li>
+                        <li>✅ Tokens refresh automatically when expired</li>
+                    </ul>
+                    
+                    <h3>Next Steps:</h3>
+                    <ol>
+                        <li>Go to <a href="/dashboard">Your Dashboard</a> to see your account info</li>
+                        <li>Use the MCP tools - they'll automatically use your saved tokens!</li>
+                        <li>No need to pass access_token or refresh_token anymore!</li>
+                    </ol>
+                    
+                    <div style="background: #fff3e0; padding: 15px; border-radius: 5px; margin-top: 20px;">
+                        <strong>For Advanced Users:</strong>
+                        <details>
+                            <summary>Show My Tokens (Click to Expand)</summary>
+""".encode("utf-8")
+
+_CALLBACK_TOKEN_BLOCK = """                            <p><strong>Access Token:</strong></p>
+                            <div class="token">{access_token}</div>
+                            {refresh_block}
+"""
+
+_CALLBACK_REFRESH_BLOCK = '<p><strong>Refresh Token:</strong></p><div class="token">{refresh_token}</div>'
+_CALLBACK_NO_REFRESH_BLOCK = '<p><em>No refresh token received.</em></p>'
+
+_CALLBACK_TAIL: bytes = """                        </details>
+                    </div>
+                    
+                    <p><a href="/">Back to Home</a></p>
+                </body>
+            </html>
+        """.encode("utf-8")
 
 
 @app.get("/oauth/callback")
 async def oauth_callback(request: Request):
     """Handle OAuth callback from Google"""
-    import httpx
-    from urllib.parse import urlencode
     
     code = request.query_params.get("code")
     error = request.query_params.get("error")
     
     if error:
-        logger.error(f"❌ OAuth error: {error}")
+        logger.error("❌ OAuth error: %s", error)
         return HTMLResponse(f"""
             <html>
                 <body>
                     <h2>Authentication Failed</h2>
-                    <p>Error: {error}</p>
+                    <p>Error: {html.escape(error)}</p>
                     <a href="/oauth/login">Try Again</a>
                 </body>
             </html>
@@ -149,150 +363,107 @@ async def oauth_callback(request: Request):
     
     if not code:
         logger.error("❌ No authorization code received")
-        return HTMLResponse("""
-            <html>
-                <body>
-                    <h2>Authentication Failed</h2>
-                    <p>No authorization code received</p>
-                    <a href="/oauth/login">Try Again</a>
-                </body>
-            </html>
-        """, status_code=400)
+        return Response(content=_NO_CODE_HTML, status_code=400, media_type="text/html")
     
     # Exchange code for tokens
-    token_url = "https://oauth2.googleapis.com/token"
     token_data = {
         "code": code,
         "client_id": GOOGLE_OAUTH_CLIENT_ID,
         "client_secret": GOOGLE_OAUTH_CLIENT_SECRET,
-        "redirect_uri": f"{PUBLIC_BASE}/oauth/callback",
+        "redirect_uri": OAUTH_REDIRECT_URI,
         "grant_type": "authorization_code",
     }
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(token_url, data=token_data)
-            response.raise_for_status()
-            tokens = response.json()
-            
+        client = _http_client()
+        response = await client.post(_GOOGLE_TOKEN_URL, data=token_data)
+        response.raise_for_status()
+        tokens = response.json()
+        
         access_token = tokens.get("access_token")
         refresh_token = tokens.get("refresh_token")
+        token_expiry = time.time() + tokens.get("expires_in", 3600)
         
         if not access_token:
             raise ValueError("No access token in response")
         
-        logger.info(f"✅ Got access token: {access_token[:20]}...")
-        if refresh_token:
-            logger.info(f"✅ Got refresh token: {refresh_token[:20]}...")
-        else:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("✅ Got access token: %s...", access_token[:20])
+            if refresh_token:
+                logger.info("✅ Got refresh token: %s...", refresh_token[:20])
+        if not refresh_token:
             logger.warning("⚠️ No refresh token received - user might need to re-consent")
         
         # Get user info
-        user_info_url = "https://www.googleapis.com/oauth2/v2/userinfo"
         headers = {"Authorization": f"Bearer {access_token}"}
         
-        async with httpx.AsyncClient() as client:
-            user_response = await client.get(user_info_url, headers=headers)
-            user_response.raise_for_status()
-            user_info = user_response.json()
+        # Build the user's GoogleAdsService while userinfo is in flight, so the
+        # first tool call after login is served from the service cache
+        credentials = _build_creds(access_token, refresh_token)
+        
+        user_response, warmed = await asyncio.gather(
+            client.get(_GOOGLE_USERINFO_URL, headers=headers),
+            _get_service_async(credentials),
+            return_exceptions=True,
+        )
+        if isinstance(user_response, BaseException):
+            raise user_response
+        if isinstance(warmed, BaseException):
+            logger.warning("⚠️ Could not pre-build Google Ads service: %s", warmed)
+        user_response.raise_for_status()
+        user_info = user_response.json()
         
         email = user_info.get("email", "unknown")
         google_user_id = user_info.get("id", "unknown")
         name = user_info.get("name", "")
         
-        logger.info(f"✅ Authenticated user: {email} (ID: {google_user_id})")
+        logger.info("✅ Authenticated user: %s (ID: %s)", email, google_user_id)
         
-        # Save tokens to database (LIKE MARBLE!)
-        db.save_user(
+        # Save tokens to database (LIKE MARBLE!) off the event loop
+        await _run_db(
+            db.save_user,
             google_user_id=google_user_id,
             email=email,
             name=name,
             access_token=access_token,
-            refresh_token=refresh_token
+            refresh_token=refresh_token,
+            token_expiry=token_expiry
         )
+        _TOKEN_CACHE[google_user_id] = (access_token, refresh_token, token_expiry)
         
         # Save user ID in session (LIKE MARBLE!)
         request.session["google_user_id"] = google_user_id
         request.session["email"] = email
         
-        return HTMLResponse(f"""
-            <html>
-                <head>
-                    <style>
-                        body {{ font-family: Arial, sans-serif; margin: 40px; }}
-                        .success {{ color: green; }}
-                        .token {{ 
-                            background: #f4f4f4; 
-                            padding: 10px; 
-                            border-radius: 5px;
-                            word-break: break-all;
-                            font-family: monospace;
-                            font-size: 12px;
-                        }}
-                    </style>
-                </head>
-                <body>
-                    <h2 class="success">✅ Authentication Successful!</h2>
-                    <p><strong>Email:</strong> {email}</p>
-                    <p><strong>User ID:</strong> {google_user_id}</p>
-                    
-                    <div style="background: #e8f5e9; padding: 20px; border-radius: 8px; margin: 20px 0;">
-                        <h3 style="color: #2e7d32; margin-top: 0;">🎉 Session Saved! (Just Like Marble)</h3>
-                        <p>Your tokens are now stored securely in the database and your session is active!</p>
-                        <p><strong>You don't need to copy or save any tokens manually!</strong></p>
-                    </div>
-                    
-                    <h3>What This Means:</h3>
-                    <ul>
-                        <li>✅ Your tokens are stored in the database</li>
-                        <li>✅ Your session is active on this device</li>
-                        <li>✅ All MCP tools will work automatically (no manual token passing!)</li>
-                        <li>✅ Works across multiple devices with the same login</li>
-                        <li>✅ Tokens refresh automatically when expired</li>
-                    </ul>
-                    
-                    <h3>Next Steps:</h3>
-                    <ol>
-                        <li>Go to <a href="/dashboard">Your Dashboard</a> to see your account info</li>
-                        <li>Use the MCP tools - they'll automatically use your saved tokens!</li>
-                        <li>No need to pass access_token or refresh_token anymore!</li>
-                    </ol>
-                    
-                    <div style="background: #fff3e0; padding: 15px; border-radius: 5px; margin-top: 20px;">
-                        <strong>For Advanced Users:</strong>
-                        <details>
-                            <summary>Show My Tokens (Click to Expand)</summary>
-                            <p><strong>Access Token:</strong></p>
-                            <div class="token">{access_token}</div>
-                            {f'<p><strong>Refresh Token:</strong></p><div class="token">{refresh_token}</div>' if refresh_token else '<p><em>No refresh token received.</em></p>'}
-                        </details>
-                    </div>
-                    
-                    <p><a href="/">Back to Home</a></p>
-                </body>
-            </html>
-        """)
+        user_block = _CALLBACK_USER_BLOCK.format(email=html.escape(email), user_id=html.escape(google_user_id))
+        refresh_block = (
+            _CALLBACK_REFRESH_BLOCK.format(refresh_token=html.escape(refresh_token))
+            if refresh_token else _CALLBACK_NO_REFRESH_BLOCK
+        )
+        token_block = _CALLBACK_TOKEN_BLOCK.format(access_token=html.escape(access_token), refresh_block=refresh_block)
+        return Response(
+            content=b"".join((
+                _CALLBACK_HEAD, user_block.encode("utf-8"),
+                _CALLBACK_MIDDLE, token_block.encode("utf-8"),
+                _CALLBACK_TAIL,
+            )),
+            media_type="text/html",
+        )
         
     except Exception as e:
-        logger.error(f"❌ Token exchange failed: {e}")
+        logger.error("❌ Token exchange failed: %s", e)
         return HTMLResponse(f"""
             <html>
                 <body>
                     <h2>Token Exchange Failed</h2>
-                    <p>Error: {str(e)}</p>
+                    <p>Error: {html.escape(str(e))}</p>
                     <a href="/oauth/login">Try Again</a>
                 </body>
             </html>
         """, status_code=500)
 
 
-@app.get("/dashboard")
-async def dashboard(request: Request):
-    """User dashboard - shows logged in status and account info"""
-    google_user_id = request.session.get("google_user_id")
-    
-    if not google_user_id:
-        return HTMLResponse("""
+_NOT_LOGGED_IN_HTML: bytes = """
             <html>
                 <head>
                     <style>
@@ -307,12 +478,10 @@ async def dashboard(request: Request):
                     <p><a href="/">Back to Home</a></p>
                 </body>
             </html>
-        """)
-    
-    user_info = db.get_user_info(google_user_id)
-    
-    if not user_info:
-        return HTMLResponse("""
+        """.encode("utf-8")
+_NOT_LOGGED_IN_RESP = _StaticPage(_NOT_LOGGED_IN_HTML, "text/html", _SESSION_PAGE_CACHE_CONTROL)
+
+_SESSION_ERROR_HTML: bytes = """
             <html>
                 <body>
                     <h2>⚠️ Session Error</h2>
@@ -320,21 +489,23 @@ async def dashboard(request: Request):
                     <p><a href="/oauth/login">🔐 Login with Google</a></p>
                 </body>
             </html>
-        """)
-    
-    return HTMLResponse(f"""
+        """.encode("utf-8")
+_SESSION_ERROR_RESP = _StaticPage(_SESSION_ERROR_HTML, "text/html", _SESSION_PAGE_CACHE_CONTROL)
+
+# Only the account box differs between users; the rest of the page is prebuilt
+_DASHBOARD_HEAD: bytes = """
         <html>
             <head>
                 <style>
-                    body {{ font-family: Arial, sans-serif; margin: 40px; }}
-                    .success {{ color: green; }}
-                    .info-box {{
+                    body { font-family: Arial, sans-serif; margin: 40px; }
+                    .success { color: green; }
+                    .info-box {
                         background: #f8f9fa;
                         padding: 20px;
                         border-radius: 8px;
                         margin: 15px 0;
-                    }}
-                    .btn {{
+                    }
+                    .btn {
                         padding: 10px 20px;
                         background: #4285f4;
                         color: white;
@@ -344,24 +515,28 @@ async def dashboard(request: Request):
                         text-decoration: none;
                         display: inline-block;
                         margin: 5px;
-                    }}
-                    .btn-danger {{
+                    }
+                    .btn-danger {
                         background: #dc3545;
-                    }}
+                    }
                 </style>
             </head>
             <body>
                 <h1>✅ Dashboard</h1>
                 
-                <div class="info-box">
+""".encode("utf-8")
+
+_DASHBOARD_ACCOUNT_BOX = """                <div class="info-box">
                     <h3>Your Account</h3>
-                    <p><strong>Email:</strong> {user_info['email']}</p>
-                    <p><strong>Name:</strong> {user_info.get('name', 'N/A')}</p>
-                    <p><strong>User ID:</strong> {user_info['google_user_id']}</p>
-                    <p><strong>Registered:</strong> {user_info['created_at']}</p>
+                    <p><strong>Email:</strong> {email}</p>
+                    <p><strong>Name:</strong> {name}</p>
+                    <p><strong>User ID:</strong> {user_id}</p>
+                    <p><strong>Registered:</strong> {created_at}</p>
                 </div>
                 
-                <div class="info-box">
+"""
+
+_DASHBOARD_TAIL: bytes = """                <div class="info-box">
                     <h3>Session Status</h3>
                     <p>✅ <strong>Logged In</strong> - Your tokens are saved and active!</p>
                     <p>✅ All MCP tools will work automatically</p>
@@ -376,21 +551,35 @@ async def dashboard(request: Request):
                 <p><a href="/">← Back to Home</a></p>
             </body>
         </html>
-    """)
+    """.encode("utf-8")
 
 
-@app.get("/logout")
-async def logout(request: Request):
-    """Logout - clear session"""
+@app.get("/dashboard")
+async def dashboard(request: Request):
+    """User dashboard - shows logged in status and account info"""
     google_user_id = request.session.get("google_user_id")
-    email = request.session.get("email", "user")
     
-    # Clear session
-    request.session.clear()
+    if not google_user_id:
+        return _NOT_LOGGED_IN_RESP.for_request(request)
     
-    logger.info(f"🚪 User logged out: {email}")
+    user_info = await _run_db(db.get_user_info, google_user_id)
     
-    return HTMLResponse("""
+    if not user_info:
+        return _SESSION_ERROR_RESP.for_request(request)
+    
+    account_box = _DASHBOARD_ACCOUNT_BOX.format(
+        email=html.escape(user_info['email']),
+        name=html.escape(str(user_info.get('name', 'N/A'))),
+        user_id=html.escape(user_info['google_user_id']),
+        created_at=user_info['created_at'],
+    )
+    return Response(
+        content=_DASHBOARD_HEAD + account_box.encode("utf-8") + _DASHBOARD_TAIL,
+        media_type="text/html",
+    )
+
+
+_LOGGED_OUT_HTML: bytes = """
         <html>
             <head>
                 <style>
@@ -406,18 +595,27 @@ async def logout(request: Request):
                 <p><a href="/">← Back to Home</a></p>
             </body>
         </html>
-    """)
+    """.encode("utf-8")
+_LOGGED_OUT_RESP = _StaticPage(_LOGGED_OUT_HTML, "text/html", _SESSION_PAGE_CACHE_CONTROL)
 
 
-@app.get("/test-tools")
-async def test_tools(request: Request):
-    """Test page for MCP tools with automatic authentication"""
+@app.get("/logout")
+async def logout(request: Request):
+    """Logout - clear session"""
     google_user_id = request.session.get("google_user_id")
+    email = request.session.get("email", "user")
     
-    if not google_user_id:
-        return RedirectResponse(url="/dashboard")
+    # Clear session
+    request.session.clear()
+    if google_user_id:
+        _TOKEN_CACHE.pop(google_user_id, None)
+    
+    logger.info("🚪 User logged out: %s", email)
     
-    return HTMLResponse("""
+    return _LOGGED_OUT_RESP.for_request(request)
+
+
+_TEST_TOOLS_HTML: bytes = """
         <html>
             <head>
                 <style>
@@ -475,7 +673,19 @@ async def test_tools(request: Request):
                 <p><a href="/dashboard">← Back to Dashboard</a></p>
             </body>
         </html>
-    """)
+    """.encode("utf-8")
+_TEST_TOOLS_RESP = _StaticPage(_TEST_TOOLS_HTML, "text/html", _SESSION_PAGE_CACHE_CONTROL)
+
+
+@app.get("/test-tools")
+async def test_tools(request: Request):
+    """Test page for MCP tools with automatic authentication"""
+    google_user_id = request.session.get("google_user_id")
+    
+    if not google_user_id:
+        return RedirectResponse(url="/dashboard")
+    
+    return _TEST_TOOLS_RESP.for_request(request)
 
 
 @app.post("/api/test-list-accounts")
@@ -484,45 +694,31 @@ async def api_test_list_accounts(request: Request):
     google_user_id = request.session.get("google_user_id")
     
     if not google_user_id:
-        return JSONResponse({"error": "Not authenticated"}, status_code=401)
+        return ORJSONResponse({"error": "Not authenticated"}, status_code=401)
     
     try:
         # Get tokens from database
-        access_token, refresh_token = db.get_user_tokens(google_user_id)
+        access_token, refresh_token = await _cached_get_user_tokens(google_user_id)
         
         if not access_token:
-            return JSONResponse({"error": "No tokens found - please re-authenticate"}, status_code=401)
+            return ORJSONResponse({"error": "No tokens found - please re-authenticate"}, status_code=401)
         
         # Call the service
-        credentials = {
-            "developer_token": GOOGLE_ADS_DEVELOPER_TOKEN,
-            "access_token": access_token,
-            "client_id": GOOGLE_OAUTH_CLIENT_ID,
-            "client_secret": GOOGLE_OAUTH_CLIENT_SECRET,
-        }
-        
-        if refresh_token:
-            credentials["refresh_token"] = refresh_token
+        credentials = _build_creds(access_token, refresh_token)
         
-        service = GoogleAdsService(user_credentials=credentials)
-        accounts = service.get_accessible_accounts()
+        service = await _get_service_async(credentials)
+        accounts = await _cached_accessible_accounts(access_token, service)
         
-        return JSONResponse({
+        return ORJSONResponse({
             "success": True,
             "message": "✅ Retrieved accounts using your saved tokens!",
             "accounts_found": len(accounts),
-            "accounts": [
-                {
-                    "id": getattr(acc, 'id', getattr(acc, 'customer_id', 'unknown')),
-                    "name": getattr(acc, 'name', getattr(acc, 'descriptive_name', 'unknown'))
-                }
-                for acc in accounts[:10]
-            ]
+            "accounts": _account_briefs(accounts[:10]),
         })
         
     except Exception as e:
-        logger.error(f"Test failed: {e}")
-        return JSONResponse({
+        logger.error("Test failed: %s", e)
+        return ORJSONResponse({
             "success": False,
             "error": str(e)
         }, status_code=500)
@@ -534,10 +730,7 @@ async def test_auth(request: Request):
     return RedirectResponse(url="/dashboard")
 
 
-@app.get("/old-test-auth")
-async def old_test_auth(request: Request):
-    """OLD test page to verify tokens work (manual token entry)"""
-    return HTMLResponse("""
+_OLD_TEST_AUTH_HTML: bytes = """
         <html>
             <head>
                 <style>
@@ -610,52 +803,43 @@ async def old_test_auth(request: Request):
                 <p><a href="/">Back to Home</a></p>
             </body>
         </html>
-    """)
+    """.encode("utf-8")
+_OLD_TEST_AUTH_RESP = _StaticPage(_OLD_TEST_AUTH_HTML, "text/html")
+
+
+@app.get("/old-test-auth")
+async def old_test_auth(request: Request):
+    """OLD test page to verify tokens work (manual token entry)"""
+    return _OLD_TEST_AUTH_RESP.for_request(request)
 
 
 @app.post("/verify-token")
 async def verify_token(request: Request):
     """Verify if a token works with Google Ads API"""
-    import httpx
-    
     body = await request.json()
     access_token = body.get("access_token")
     refresh_token = body.get("refresh_token")
     
     if not access_token:
-        return JSONResponse({"error": "access_token required"}, status_code=400)
+        return ORJSONResponse({"error": "access_token required"}, status_code=400)
     
     try:
         # Test the token by calling Google Ads API
-        credentials = {
-            "developer_token": GOOGLE_ADS_DEVELOPER_TOKEN,
-            "access_token": access_token,
-            "client_id": GOOGLE_OAUTH_CLIENT_ID,
-            "client_secret": GOOGLE_OAUTH_CLIENT_SECRET,
-        }
+        credentials = _build_creds(access_token, refresh_token)
         
-        if refresh_token:
-            credentials["refresh_token"] = refresh_token
+        service = await _get_service_async(credentials)
+        accounts = await _cached_accessible_accounts(access_token, service)
         
-        service = GoogleAdsService(user_credentials=credentials)
-        accounts = service.get_accessible_accounts()
-        
-        return JSONResponse({
+        return ORJSONResponse({
             "success": True,
             "message": "✅ Token is valid!",
             "accounts_found": len(accounts),
-            "accounts": [
-                {
-                    "id": getattr(acc, 'id', getattr(acc, 'customer_id', 'unknown')),
-                    "name": getattr(acc, 'name', getattr(acc, 'descriptive_name', 'unknown'))
-                }
-                for acc in accounts[:5]  # Show first 5
-            ]
+            "accounts": _account_briefs(accounts[:5]),  # Show first 5
         })
         
     except Exception as e:
-        logger.error(f"Token verification failed: {e}")
-        return JSONResponse({
+        logger.error("Token verification failed: %s", e)
+        return ORJSONResponse({
             "success": False,
             "error": str(e),
             "message": "❌ Token verification failed"
@@ -665,34 +849,272 @@ async def verify_token(request: Request):
 # --------------------------------------------------------------------------------------
 # Helper Functions
 # --------------------------------------------------------------------------------------
-def _normalize(obj_list: List) -> List[Dict]:
-    """Convert objects to dictionaries"""
-    out = []
-    for a in obj_list:
-        try:
-            if is_dataclass(a):
-                out.append(asdict(a))
-                continue
-        except Exception:
-            pass
-
-        if hasattr(a, "__dict__"):
-            try:
-                out.append(vars(a))
-                continue
-            except Exception:
-                pass
-
-        if isinstance(a, dict):
-            out.append(a)
-            continue
+def _unknown(a: Any) -> str:
+    return "unknown"
+
+
+def _first_attr(sample: Any, *names: str) -> Callable[[Any], Any]:
+    """attrgetter for the first of names that sample has"""
+    for name in names:
+        if hasattr(sample, name):
+            return attrgetter(name)
+    return _unknown
+
+
+def _account_briefs(accounts: List) -> List[Dict]:
+    """{"id", "name"} per account; the attribute names are resolved once from the first row"""
+    if not accounts:
+        return []
+    sample = accounts[0]
+    get_id = _first_attr(sample, "id", "customer_id")
+    get_name = _first_attr(sample, "name", "descriptive_name")
+    return [{"id": get_id(a), "name": get_name(a)} for a in accounts]
+
 
-        try:
-            out.append(dict(a))
-        except Exception:
-            out.append({"raw": str(a)})
+def _ads_error(prefix: str, ex: GoogleAdsException) -> RuntimeError:
+    """Build a compact error from a GoogleAdsException (status, first error, request id)
+    without stringifying the whole failure proto."""
+    errors = ex.failure.errors
+    detail = f": {errors[0].message}" if errors else ""
+    return RuntimeError(f"{prefix}: {ex.error.code().name}{detail} (request_id={ex.request_id})")
 
-    return out
+
+@contextmanager
+def _ads_errors(prefix: str):
+    """Translate Google Ads / token-refresh failures inside a tool into RuntimeErrors"""
+    try:
+        yield
+    except GoogleAdsException as ex:
+        raise _ads_error(prefix, ex) from ex
+    except RefreshError as ex:
+        raise RuntimeError(f"{prefix}: token refresh failed - please re-authenticate at {PUBLIC_BASE}/oauth/login") from ex
+
+
+# The Google Ads SDK is blocking (gRPC); tools run it in worker threads so concurrent
+# MCP calls are not serialized on the event loop. The semaphore keeps bursts from
+# exhausting the default thread pool.
+_ADS_CONCURRENCY = asyncio.Semaphore(32)
+
+
+async def _run_blocking(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run a blocking Google Ads call in a worker thread"""
+    async with _ADS_CONCURRENCY:
+        return await asyncio.to_thread(fn, *args)
+
+
+# Static part of every user's credentials dict
+_BASE_CREDS = MappingProxyType({
+    "developer_token": GOOGLE_ADS_DEVELOPER_TOKEN,
+    "client_id": GOOGLE_OAUTH_CLIENT_ID,
+    "client_secret": GOOGLE_OAUTH_CLIENT_SECRET,
+})
+
+
+def _build_creds(access_token: str, refresh_token: Optional[str] = None) -> Dict[str, str]:
+    """Credentials dict for GoogleAdsService from the static base plus the user's tokens"""
+    credentials = dict(_BASE_CREDS)
+    credentials["access_token"] = access_token
+    if refresh_token:
+        credentials["refresh_token"] = refresh_token
+    return credentials
+
+
+# Authenticated services (and their gRPC channels) keyed by a hash of the tokens.
+# Entries expire shortly before the one-hour access-token lifetime.
+_SERVICE_CACHE: TTLCache = TTLCache(maxsize=256, ttl=3300)
+_SERVICE_CACHE_LOCK = threading.Lock()
+# Services being built right now, so concurrent first calls for the same
+# tokens wait for one build (and share one credentials object, hence one
+# token refresh) instead of each creating a client
+_SERVICE_BUILDS: Dict[str, Future] = {}
+
+
+def _service_key(credentials: Dict[str, str]) -> str:
+    return hashlib.sha256(
+        f"{credentials.get('access_token')}|{credentials.get('refresh_token')}|"
+        f"{credentials.get('developer_token')}".encode()
+    ).hexdigest()
+
+
+def _get_service(credentials: Dict[str, str]) -> GoogleAdsService:
+    """Return a cached GoogleAdsService for these credentials, building it on first use.
+
+    Blocks while building or waiting for another thread's build; on the event
+    loop use _get_service_async."""
+    key = _service_key(credentials)
+    with _SERVICE_CACHE_LOCK:
+        service = _SERVICE_CACHE.get(key)
+        if service is not None:
+            return service
+        build = _SERVICE_BUILDS.get(key)
+        owner = build is None
+        if owner:
+            build = _SERVICE_BUILDS[key] = Future()
+
+    if not owner:
+        return build.result()
+
+    try:
+        service = GoogleAdsService(user_credentials=credentials)
+    except BaseException as ex:
+        with _SERVICE_CACHE_LOCK:
+            del _SERVICE_BUILDS[key]
+        build.set_exception(ex)
+        raise
+    with _SERVICE_CACHE_LOCK:
+        _SERVICE_CACHE[key] = service
+        del _SERVICE_BUILDS[key]
+    build.set_result(service)
+    return service
+
+
+async def _get_service_async(credentials: Dict[str, str]) -> GoogleAdsService:
+    """_get_service without blocking the event loop: cache hits return directly,
+    an in-flight build is awaited, and a new build runs in a worker thread"""
+    key = _service_key(credentials)
+    with _SERVICE_CACHE_LOCK:
+        service = _SERVICE_CACHE.get(key)
+        build = _SERVICE_BUILDS.get(key)
+    if service is not None:
+        return service
+    if build is not None:
+        return await asyncio.wrap_future(build)
+    return await _run_blocking(_get_service, credentials)
+
+
+# Accessible-account lists change rarely; keep each token's list for a minute so
+# repeated list calls from one session don't each hit the Google Ads API.
+_ACCOUNTS_CACHE: TTLCache = TTLCache(maxsize=512, ttl=60)
+
+
+async def _cached_accessible_accounts(access_token: str, service: GoogleAdsService) -> List:
+    """service.get_accessible_accounts(), memoized per access token for 60s"""
+    key = hashlib.sha256(access_token.encode()).digest()
+    accounts = _ACCOUNTS_CACHE.get(key)
+    if accounts is None:
+        accounts = await _run_blocking(service.get_accessible_accounts)
+        _ACCOUNTS_CACHE[key] = accounts
+    return accounts
+
+
+# Saved (access_token, refresh_token, token_expiry) per google_user_id, so tool
+# calls don't each hit SQLite. Filled on login, dropped on logout; misses are
+# never cached. The cache is per worker process: logout only clears the worker
+# that served it, and other workers keep their copy for up to the TTL, so keep
+# TOKEN_CACHE_TTL short.
+_TokenRecord = Tuple[Optional[str], Optional[str], Optional[float]]
+_TOKEN_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=int(os.getenv("TOKEN_CACHE_TTL", "30")))
+# Lookups / refreshes already running, so tools fired together share one
+_TOKEN_LOOKUPS: Dict[str, "asyncio.Future[_TokenRecord]"] = {}
+_TOKEN_REFRESHES: Dict[str, "asyncio.Future[_TokenRecord]"] = {}
+
+# Refresh this long before expiry rather than letting a Google Ads call fail first
+_TOKEN_REFRESH_MARGIN = 60
+
+
+# Token lookups queued within one window go to SQLite as a single IN (...) query
+_TOKEN_BATCH: Dict[str, "asyncio.Future[_TokenRecord]"] = {}
+_TOKEN_BATCH_WINDOW = 0.005
+_NO_TOKENS: _TokenRecord = (None, None, None)
+
+
+def _batch_get_token_record(google_user_id: str) -> "asyncio.Future[_TokenRecord]":
+    """Queue a token lookup for the next batch, flushed after _TOKEN_BATCH_WINDOW"""
+    fut = _TOKEN_BATCH.get(google_user_id)
+    if fut is None:
+        loop = asyncio.get_running_loop()
+        if not _TOKEN_BATCH:
+            loop.call_later(_TOKEN_BATCH_WINDOW, _flush_token_batch)
+        fut = _TOKEN_BATCH[google_user_id] = loop.create_future()
+    return fut
+
+
+def _flush_token_batch() -> None:
+    batch = _TOKEN_BATCH.copy()
+    _TOKEN_BATCH.clear()
+    lookup = asyncio.get_running_loop().run_in_executor(
+        _DB_EXECUTOR, db.get_user_token_records, list(batch)
+    )
+    lookup.add_done_callback(partial(_settle_token_batch, batch))
+
+
+def _settle_token_batch(
+    batch: Dict[str, "asyncio.Future[_TokenRecord]"],
+    lookup: "asyncio.Future[Dict[str, _TokenRecord]]",
+) -> None:
+    error = asyncio.CancelledError() if lookup.cancelled() else lookup.exception()
+    records = {} if error else lookup.result()
+    for google_user_id, fut in batch.items():
+        if fut.done():
+            continue
+        if error:
+            fut.set_exception(error)
+        else:
+            record = records.get(google_user_id)
+            if record is None:
+                logger.warning("⚠️  No tokens found for user: %s", google_user_id)
+            fut.set_result(record or _NO_TOKENS)
+
+
+def _shared(
+    pending: Dict[str, "asyncio.Future[_TokenRecord]"],
+    key: str,
+    make: Callable[[], Awaitable[_TokenRecord]],
+) -> "asyncio.Future[_TokenRecord]":
+    """The running task for key, starting make() if there is none"""
+    task = pending.get(key)
+    if task is None:
+        task = pending[key] = asyncio.ensure_future(make())
+        task.add_done_callback(lambda _: pending.pop(key, None))
+    return task
+
+
+async def _refresh_user_tokens(google_user_id: str, record: _TokenRecord) -> _TokenRecord:
+    """Exchange the saved refresh token for a new access token and persist it"""
+    _, refresh_token, _ = record
+    try:
+        response = await _http_client().post(_GOOGLE_TOKEN_URL, data={
+            "client_id": GOOGLE_OAUTH_CLIENT_ID,
+            "client_secret": GOOGLE_OAUTH_CLIENT_SECRET,
+            "refresh_token": refresh_token,
+            "grant_type": "refresh_token",
+        })
+        response.raise_for_status()
+        tokens = response.json()
+    except (httpx.HTTPError, ValueError) as e:
+        # Keep the old tokens; the client's own refresh path still applies
+        logger.warning("⚠️ Proactive token refresh failed for %s: %s", google_user_id, e)
+        return record
+
+    access_token = tokens["access_token"]
+    refresh_token = tokens.get("refresh_token") or refresh_token
+    token_expiry = time.time() + tokens.get("expires_in", 3600)
+    await _run_db(db.update_tokens, google_user_id, access_token, refresh_token, token_expiry)
+    return access_token, refresh_token, token_expiry
+
+
+async def _cached_get_user_tokens(google_user_id: str) -> Tuple[Optional[str], Optional[str]]:
+    """(access_token, refresh_token) for a user, memoized for TOKEN_CACHE_TTL
+    (30s by default) and refreshed shortly before the access token expires"""
+    record = _TOKEN_CACHE.get(google_user_id)
+    if record is None:
+        # shield: one caller being cancelled must not cancel the others' lookup
+        record = await asyncio.shield(_shared(
+            _TOKEN_LOOKUPS, google_user_id,
+            partial(_batch_get_token_record, google_user_id),
+        ))
+
+    access_token, refresh_token, token_expiry = record
+    if refresh_token and token_expiry and token_expiry - time.time() < _TOKEN_REFRESH_MARGIN:
+        record = await asyncio.shield(_shared(
+            _TOKEN_REFRESHES, google_user_id,
+            partial(_refresh_user_tokens, google_user_id, record),
+        ))
+        access_token, refresh_token, token_expiry = record
+
+    if access_token:
+        _TOKEN_CACHE[google_user_id] = record
+    return access_token, refresh_token
 
 
 # --------------------------------------------------------------------------------------
@@ -713,11 +1135,33 @@ def get_credentials_from_context() -> Dict[str, str]:
     raise NotImplementedError("Use HTTP API endpoints for automatic auth")
 
 
+async def _resolve_service(
+    access_token: Optional[str],
+    refresh_token: Optional[str],
+    google_user_id: Optional[str],
+) -> Tuple[GoogleAdsService, str]:
+    """Resolve a tool's auth arguments to (service, access_token).
+
+    Explicit tokens win; otherwise the user's saved tokens are loaded.
+    """
+    # Auto-fetch tokens if google_user_id provided
+    if google_user_id and not access_token:
+        logger.debug("🔄 Fetching saved tokens for user: %s", google_user_id)
+        access_token, refresh_token = await _cached_get_user_tokens(google_user_id)
+        if not access_token:
+            raise RuntimeError(f"No saved tokens found for user {google_user_id}. Please authenticate at {PUBLIC_BASE}/oauth/login")
+
+    if not access_token:
+        raise RuntimeError(f"Either access_token or google_user_id must be provided. Authenticate at: {PUBLIC_BASE}/oauth/login")
+
+    return await _get_service_async(_build_creds(access_token, refresh_token)), access_token
+
+
 # --------------------------------------------------------------------------------------
 # MCP Tools (with optional automatic auth)
 # --------------------------------------------------------------------------------------
 @mcp.tool()
-def list_accessible_accounts(
+async def list_accessible_accounts(
     access_token: Optional[str] = None,
     refresh_token: Optional[str] = None,
     google_user_id: Optional[str] = None
@@ -737,36 +1181,14 @@ def list_accessible_accounts(
         refresh_token: Your OAuth refresh token (optional)
         google_user_id: Your Google user ID to fetch saved tokens (optional)
     """
-    try:
-        # Auto-fetch tokens if google_user_id provided
-        if google_user_id and not access_token:
-            logger.info(f"🔄 Fetching saved tokens for user: {google_user_id}")
-            access_token, refresh_token = db.get_user_tokens(google_user_id)
-            if not access_token:
-                raise RuntimeError(f"No saved tokens found for user {google_user_id}. Please authenticate at {PUBLIC_BASE}/oauth/login")
-        
-        if not access_token:
-            raise RuntimeError(f"Either access_token or google_user_id must be provided. Authenticate at: {PUBLIC_BASE}/oauth/login")
-        
-        credentials = {
-            "developer_token": GOOGLE_ADS_DEVELOPER_TOKEN,
-            "access_token": access_token,
-            "client_id": GOOGLE_OAUTH_CLIENT_ID,
-            "client_secret": GOOGLE_OAUTH_CLIENT_SECRET,
-        }
-        
-        if refresh_token:
-            credentials["refresh_token"] = refresh_token
-        
-        service = GoogleAdsService(user_credentials=credentials)
-        accounts = service.get_accessible_accounts()
-        return _normalize(accounts)
-    except Exception as e:
-        raise RuntimeError(f"Failed to list accounts: {str(e)}")
+    with _ads_errors("Failed to list accounts"):
+        service, access_token = await _resolve_service(access_token, refresh_token, google_user_id)
+        accounts = await _cached_accessible_accounts(access_token, service)
+        return to_dicts(accounts)
 
 
 @mcp.tool()
-def get_account_summary(
+async def get_account_summary(
     customer_id: str,
     access_token: Optional[str] = None,
     refresh_token: Optional[str] = None,
@@ -789,35 +1211,14 @@ def get_account_summary(
         google_user_id: Your Google user ID to fetch saved tokens (optional)
         days: Number of days to look back (default: 30)
     """
-    try:
-        # Auto-fetch tokens if google_user_id provided
-        if google_user_id and not access_token:
-            access_token, refresh_token = db.get_user_tokens(google_user_id)
-            if not access_token:
-                raise RuntimeError(f"No saved tokens found for user {google_user_id}")
-        
-        if not access_token:
-            raise RuntimeError("Either access_token or google_user_id must be provided")
-        
-        credentials = {
-            "developer_token": GOOGLE_ADS_DEVELOPER_TOKEN,
-            "access_token": access_token,
-            "client_id": GOOGLE_OAUTH_CLIENT_ID,
-            "client_secret": GOOGLE_OAUTH_CLIENT_SECRET,
-        }
-        
-        if refresh_token:
-            credentials["refresh_token"] = refresh_token
-        
-        service = GoogleAdsService(user_credentials=credentials)
-        summary = service.get_account_summary(customer_id, days)
+    with _ads_errors("Failed to get account summary"):
+        service, _ = await _resolve_service(access_token, refresh_token, google_user_id)
+        summary = await _run_blocking(service.get_account_summary, customer_id, days)
         return summary or {"message": f"No data found for account {customer_id}"}
-    except Exception as e:
-        raise RuntimeError(f"Failed to get account summary: {str(e)}")
 
 
 @mcp.tool()
-def get_campaigns(
+async def get_campaigns(
     customer_id: str,
     access_token: Optional[str] = None,
     refresh_token: Optional[str] = None,
@@ -842,35 +1243,14 @@ def get_campaigns(
         days: Number of days to look back (default: 30)
         limit: Maximum number of campaigns to return (default: 100)
     """
-    try:
-        # Auto-fetch tokens if google_user_id provided
-        if google_user_id and not access_token:
-            access_token, refresh_token = db.get_user_tokens(google_user_id)
-            if not access_token:
-                raise RuntimeError(f"No saved tokens found for user {google_user_id}")
-        
-        if not access_token:
-            raise RuntimeError("Either access_token or google_user_id must be provided")
-        
-        credentials = {
-            "developer_token": GOOGLE_ADS_DEVELOPER_TOKEN,
-            "access_token": access_token,
-            "client_id": GOOGLE_OAUTH_CLIENT_ID,
-            "client_secret": GOOGLE_OAUTH_CLIENT_SECRET,
-        }
-        
-        if refresh_token:
-            credentials["refresh_token"] = refresh_token
-        
-        service = GoogleAdsService(user_credentials=credentials)
-        campaigns = service.get_campaigns(customer_id, days, limit)
-        return _normalize(campaigns)
-    except Exception as e:
-        raise RuntimeError(f"Failed to get campaigns: {str(e)}")
+    with _ads_errors("Failed to get campaigns"):
+        service, _ = await _resolve_service(access_token, refresh_token, google_user_id)
+        campaigns = await _run_blocking(service.get_campaigns, customer_id, days, limit)
+        return to_dicts(campaigns)
 
 
 @mcp.tool()
-def get_keywords(
+async def get_keywords(
     customer_id: str,
     access_token: Optional[str] = None,
     refresh_token: Optional[str] = None,
@@ -897,39 +1277,16 @@ def get_keywords(
         days: Number of days to look back (default: 30)
         limit: Maximum number of keywords to return (default: 100)
     """
-    try:
-        # Auto-fetch tokens if google_user_id provided
-        if google_user_id and not access_token:
-            access_token, refresh_token = db.get_user_tokens(google_user_id)
-            if not access_token:
-                raise RuntimeError(f"No saved tokens found for user {google_user_id}")
-        
-        if not access_token:
-            raise RuntimeError("Either access_token or google_user_id must be provided")
-        
-        credentials = {
-            "developer_token": GOOGLE_ADS_DEVELOPER_TOKEN,
-            "access_token": access_token,
-            "client_id": GOOGLE_OAUTH_CLIENT_ID,
-            "client_secret": GOOGLE_OAUTH_CLIENT_SECRET,
-        }
-        
-        if refresh_token:
-            credentials["refresh_token"] = refresh_token
-        
-        service = GoogleAdsService(user_credentials=credentials)
-        keywords = service.get_keywords(customer_id, campaign_id, days, limit)
-        return _normalize(keywords)
-    except Exception as e:
-        raise RuntimeError(f"Failed to get keywords: {str(e)}")
+    with _ads_errors("Failed to get keywords"):
+        service, _ = await _resolve_service(access_token, refresh_token, google_user_id)
+        keywords = await _run_blocking(service.get_keywords, customer_id, campaign_id, days, limit)
+        return to_dicts(keywords)
 
 
 # --------------------------------------------------------------------------------------
 # Resources
 # --------------------------------------------------------------------------------------
-@mcp.resource("google-ads://help")
-def help_resource() -> str:
-    return f"""
+_HELP_TEXT = f"""
 Google Ads MCP Server - Marble-Like Authentication Guide
 =========================================================
 
@@ -1002,12 +1359,15 @@ UPGRADE TO PRODUCTION:
 """
 
 
+@mcp.resource("google-ads://help")
+def help_resource() -> str:
+    return _HELP_TEXT
+
+
 # --------------------------------------------------------------------------------------
 # Home Page
 # --------------------------------------------------------------------------------------
-@app.get("/")
-async def index():
-    return HTMLResponse(f"""
+_INDEX_HTML: bytes = f"""
         <html>
             <head>
                 <style>
@@ -1104,55 +1464,96 @@ async def index():
                 </ul>
             </body>
         </html>
-    """)
+    """.encode("utf-8")
+# The home page only changes on deploy; let browsers keep it for five minutes
+_INDEX_RESP = _StaticPage(_INDEX_HTML, "text/html", "public, max-age=300")
+
+
+@app.get("/")
+async def index(request: Request):
+    return _INDEX_RESP.for_request(request)
 
 
 # --------------------------------------------------------------------------------------
 # Health Check
 # --------------------------------------------------------------------------------------
-@app.get("/healthz")
-async def health():
-    return JSONResponse({
-        "status": "healthy",
-        "oauth_configured": bool(GOOGLE_OAUTH_CLIENT_ID and GOOGLE_OAUTH_CLIENT_SECRET),
-        "developer_token_configured": bool(GOOGLE_ADS_DEVELOPER_TOKEN),
-        "public_base": PUBLIC_BASE
-    })
+_HEALTH_JSON: bytes = orjson.dumps({
+    "status": "healthy",
+    "oauth_configured": bool(GOOGLE_OAUTH_CLIENT_ID and GOOGLE_OAUTH_CLIENT_SECRET),
+    "developer_token_configured": bool(GOOGLE_ADS_DEVELOPER_TOKEN),
+    "public_base": PUBLIC_BASE
+})
+# Probes must always reach the process, so only allow revalidation here
+_HEALTH_RESP = _StaticPage(_HEALTH_JSON, "application/json", "no-cache")
+
+
+# Load balancers often probe with HEAD, so these routes accept it as well
+@app.api_route("/healthz", methods=["GET", "HEAD"])
+async def health(request: Request):
+    return _HEALTH_RESP.for_request(request)
 
 
 # --------------------------------------------------------------------------------------
 # Well-known OAuth metadata
 # --------------------------------------------------------------------------------------
-@app.get("/.well-known/oauth-authorization-server")
-async def oauth_metadata():
-    return JSONResponse({
-        "issuer": PUBLIC_BASE,
-        "authorization_endpoint": f"{PUBLIC_BASE}/oauth/login",
-        "token_endpoint": f"{PUBLIC_BASE}/oauth/callback",
-        "scopes_supported": [
-            "https://www.googleapis.com/auth/adwords",
-            "openid",
-            "email",
-            "profile"
-        ]
-    })
-
-
-@app.get("/.well-known/oauth-protected-resource")
-async def oauth_protected_resource():
+_OAUTH_METADATA_JSON: bytes = orjson.dumps({
+    "issuer": PUBLIC_BASE,
+    "authorization_endpoint": f"{PUBLIC_BASE}/oauth/login",
+    "token_endpoint": f"{PUBLIC_BASE}/oauth/callback",
+    "scopes_supported": [
+        "https://www.googleapis.com/auth/adwords",
+        "openid",
+        "email",
+        "profile"
+    ]
+})
+_OAUTH_METADATA_RESP = _StaticPage(_OAUTH_METADATA_JSON, "application/json")
+
+
+@app.api_route("/.well-known/oauth-authorization-server", methods=["GET", "HEAD"])
+async def oauth_metadata(request: Request):
+    return _OAUTH_METADATA_RESP.for_request(request)
+
+
+_PROTECTED_RESOURCE_RESP = _StaticPage(orjson.dumps({
+    "resource": PUBLIC_BASE,
+    "authorization_servers": [PUBLIC_BASE],
+    "scopes_supported": [
+        "https://www.googleapis.com/auth/adwords",
+        "openid",
+        "email",
+        "profile"
+    ],
+    "bearer_methods_supported": ["header"],
+    "resource_signing_alg_values_supported": ["RS256"]
+}), "application/json")
+
+
+@app.api_route("/.well-known/oauth-protected-resource", methods=["GET", "HEAD"])
+async def oauth_protected_resource(request: Request):
     """OAuth 2.0 Protected Resource Metadata"""
-    return JSONResponse({
-        "resource": PUBLIC_BASE,
-        "authorization_servers": [PUBLIC_BASE],
-        "scopes_supported": [
-            "https://www.googleapis.com/auth/adwords",
-            "openid",
-            "email",
-            "profile"
-        ],
-        "bearer_methods_supported": ["header"],
-        "resource_signing_alg_values_supported": ["RS256"]
-    })
+    return _PROTECTED_RESOURCE_RESP.for_request(request)
+
+
+# --------------------------------------------------------------------------------------
+# Mount MCP (at import time so every uvicorn worker process serves it)
+# --------------------------------------------------------------------------------------
+mcp_app = mcp.http_app()
+app.mount("/mcp", mcp_app)
+
+# Mounted sub-apps don't get lifespan events, so FastMCP's session manager has to
+# be started from ours; wrapping the default lifespan keeps the on_event hooks.
+_app_lifespan = app.router.lifespan_context
+
+
+@asynccontextmanager
+async def _lifespan(a):
+    async with mcp_app.lifespan(a):
+        async with _app_lifespan(a) as state:
+            yield state
+
+
+app.router.lifespan_context = _lifespan
 
 
 if __name__ == "__main__":
@@ -1160,22 +1561,41 @@ if __name__ == "__main__":
     
     port = int(os.getenv("PORT", "7070"))
     host = os.getenv("HOST", "0.0.0.0")
+    # MCP sessions (Mcp-Session-Id) live in the worker that created them, so
+    # more than one worker needs a proxy with sticky routing on that header
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
     
     logger.info("=" * 60)
     logger.info("🚀 Starting Google Ads MCP Server")
     logger.info("=" * 60)
-    logger.info(f"📡 Server: http://{host}:{port}")
+    logger.info(f"📡 Server: http://{host}:{port} ({workers} workers)")
     logger.info(f"🌐 Public URL: {PUBLIC_BASE}")
     logger.info(f"🔐 OAuth Login: {PUBLIC_BASE}/oauth/login")
-    logger.info(f"📋 MCP Endpoint: {PUBLIC_BASE}/mcp")
-    logger.info("=" * 60)
-    
-    # Mount the MCP server PROPERLY
-    mcp_app = mcp.http_app()
-    
-    # Mount MCP at /mcp for the URL you're using
-    app.mount("/mcp", mcp_app)
     logger.info("✅ MCP mounted at /mcp")
+    logger.info(f"📋 MCP Endpoint: {PUBLIC_BASE}/mcp")
     logger.info(f"📱 Claude Desktop: Use URL {PUBLIC_BASE}/mcp")
+    logger.info("=" * 60)
     
-    uvicorn.run(app, host=host, port=port)
\ No newline at end of file
+    # Multiple workers need an import string; each worker builds its own
+    # Google Ads clients / gRPC channels after start-up.
+    # "auto" picks uvloop + httptools when installed (uvicorn[standard]) and
+    # falls back to asyncio / h11 where they are unavailable (e.g. Windows).
+    uvicorn.run(
+        "googleads_final:app",
+        host=host,
+        port=port,
+        workers=workers,
+        loop="auto",
+        http="auto",
+        backlog=2048,
+        # Longer than the fronting proxy's idle timeout, so the proxy never
+        # reuses a connection uvicorn has just closed
+        timeout_keep_alive=75,
+        log_level="info",
+        # Render / Cloud Run terminate TLS in front of us; trust X-Forwarded-*
+        # so redirects and request.url use the public scheme and host. Only
+        # localhost is trusted by default; set FORWARDED_ALLOW_IPS="*" where
+        # the app is reachable solely through the proxy.
+        proxy_headers=True,
+        forwarded_allow_ips=os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+    )
@@ -15,9 +15,15 @@ FastMCP Cloud deployment: Set these environment variables:
 """
 
 from fastmcp import FastMCP, Context
-from typing import List, Dict, Optional
-from dataclasses import is_dataclass, asdict
+from typing import List, Dict, Mapping, Optional
+from types import MappingProxyType
 import os
+import hashlib
+import threading
+
+from cachetools import TTLCache
+
+from core.utils import to_dicts
 
 try:
     from core.services.google_ads_service import GoogleAdsService
@@ -33,8 +39,30 @@ except Exception as e:
 # Create server with HTTP transport (required for OAuth)
 mcp = FastMCP("Google Ads MCP")
 
-
-def _get_user_credentials(context: Context) -> dict:
+# Environment is read once at import instead of on every tool call
+FASTMCP_GOOGLE_CLIENT_ID = os.getenv("FASTMCP_SERVER_AUTH_GOOGLE_CLIENT_ID")
+FASTMCP_GOOGLE_CLIENT_SECRET = os.getenv("FASTMCP_SERVER_AUTH_GOOGLE_CLIENT_SECRET")
+FASTMCP_GOOGLE_BASE_URL = os.getenv("FASTMCP_SERVER_AUTH_GOOGLE_BASE_URL", "http://localhost:7070")
+GOOGLE_ADS_CLIENT_ID = os.getenv("GOOGLE_ADS_CLIENT_ID")
+GOOGLE_ADS_CLIENT_SECRET = os.getenv("GOOGLE_ADS_CLIENT_SECRET")
+GOOGLE_ADS_DEVELOPER_TOKEN = os.getenv("GOOGLE_ADS_DEVELOPER_TOKEN")
+GOOGLE_ADS_REFRESH_TOKEN = os.getenv("GOOGLE_ADS_REFRESH_TOKEN")
+
+# Static parts of the credentials dicts; GoogleAdsService only reads them
+_USER_BASE_CREDS = MappingProxyType({
+    "client_id": FASTMCP_GOOGLE_CLIENT_ID,
+    "client_secret": FASTMCP_GOOGLE_CLIENT_SECRET,
+    "developer_token": GOOGLE_ADS_DEVELOPER_TOKEN,
+})
+_FALLBACK_CREDS = MappingProxyType({
+    "refresh_token": GOOGLE_ADS_REFRESH_TOKEN,
+    "client_id": FASTMCP_GOOGLE_CLIENT_ID or GOOGLE_ADS_CLIENT_ID,
+    "client_secret": FASTMCP_GOOGLE_CLIENT_SECRET or GOOGLE_ADS_CLIENT_SECRET,
+    "developer_token": GOOGLE_ADS_DEVELOPER_TOKEN,
+})
+
+
+def _get_user_credentials(context: Context) -> Mapping[str, Optional[str]]:
     """
     Extract Google OAuth credentials from FastMCP's context.
     
@@ -48,19 +76,21 @@ def _get_user_credentials(context: Context) -> dict:
             user = request.state.user
             
             # Build credentials dict for GoogleAdsService
-            credentials = {
-                "access_token": user.get("access_token") if isinstance(user, dict) else getattr(user, "access_token", None),
-                "refresh_token": user.get("refresh_token") if isinstance(user, dict) else getattr(user, "refresh_token", None),
-                "client_id": os.getenv("FASTMCP_SERVER_AUTH_GOOGLE_CLIENT_ID"),
-                "client_secret": os.getenv("FASTMCP_SERVER_AUTH_GOOGLE_CLIENT_SECRET"),
-                "developer_token": os.getenv("GOOGLE_ADS_DEVELOPER_TOKEN"),
-            }
+            if isinstance(user, dict):
+                access_token = user.get("access_token")
+                refresh_token = user.get("refresh_token")
+            else:
+                access_token = getattr(user, "access_token", None)
+                refresh_token = getattr(user, "refresh_token", None)
             
             # Validate required fields
-            if not credentials["developer_token"]:
+            if not GOOGLE_ADS_DEVELOPER_TOKEN:
                 raise ValueError("GOOGLE_ADS_DEVELOPER_TOKEN environment variable is required")
             
-            if credentials["access_token"] or credentials["refresh_token"]:
+            if access_token or refresh_token:
+                credentials = dict(_USER_BASE_CREDS)
+                credentials["access_token"] = access_token
+                credentials["refresh_token"] = refresh_token
                 return credentials
     except Exception as e:
         # Log but continue to fallback
@@ -68,14 +98,8 @@ def _get_user_credentials(context: Context) -> dict:
     
     # Fallback: use environment variables or stored tokens
     # This allows testing without full OAuth setup
-    env_refresh_token = os.getenv("GOOGLE_ADS_REFRESH_TOKEN")
-    if env_refresh_token:
-        return {
-            "refresh_token": env_refresh_token,
-            "client_id": os.getenv("FASTMCP_SERVER_AUTH_GOOGLE_CLIENT_ID") or os.getenv("GOOGLE_ADS_CLIENT_ID"),
-            "client_secret": os.getenv("FASTMCP_SERVER_AUTH_GOOGLE_CLIENT_SECRET") or os.getenv("GOOGLE_ADS_CLIENT_SECRET"),
-            "developer_token": os.getenv("GOOGLE_ADS_DEVELOPER_TOKEN"),
-        }
+    if GOOGLE_ADS_REFRESH_TOKEN:
+        return _FALLBACK_CREDS
     
     raise ValueError(
         "User not authenticated and no fallback credentials found. "
@@ -85,35 +109,26 @@ def _get_user_credentials(context: Context) -> dict:
     )
 
 
-def _normalize_accounts(accounts: List) -> List[Dict]:
-    """Convert Account objects to plain dicts for JSON serialization."""
-    out = []
-    for a in accounts:
-        try:
-            if is_dataclass(a):
-                out.append(asdict(a))
-                continue
-        except Exception:
-            pass
-
-        if hasattr(a, "__dict__"):
-            try:
-                out.append(vars(a))
-                continue
-            except Exception:
-                pass
-
-        if isinstance(a, dict):
-            out.append(a)
-            continue
+# Authenticated services (and their gRPC channels) keyed by a hash of the tokens,
+# expiring shortly before the one-hour access-token lifetime. A refreshed token
+# hashes to a new key, so a stale client is never reused.
+_SERVICE_CACHE: TTLCache = TTLCache(maxsize=256, ttl=3300)
+_SERVICE_CACHE_LOCK = threading.Lock()
 
-        try:
-            out.append(dict(a))
-            continue
-        except Exception:
-            out.append({"raw": str(a)})
 
-    return out
+def _get_service(credentials: Mapping[str, Optional[str]]) -> GoogleAdsService:
+    """Return a cached GoogleAdsService for these credentials, building it on first use."""
+    key = hashlib.sha256(
+        f"{credentials.get('access_token')}|{credentials.get('refresh_token')}|"
+        f"{credentials.get('client_id')}".encode()
+    ).hexdigest()
+    with _SERVICE_CACHE_LOCK:
+        service = _SERVICE_CACHE.get(key)
+    if service is None:
+        service = GoogleAdsService(user_credentials=credentials)
+        with _SERVICE_CACHE_LOCK:
+            service = _SERVICE_CACHE.setdefault(key, service)
+    return service
 
 
 # ============================================================================
@@ -134,13 +149,13 @@ def list_accessible_accounts(context: Context) -> List[Dict]:
     # Get the current user's credentials from FastMCP's auth context
     credentials = _get_user_credentials(context)
     
-    # Create service instance with user's credentials
-    service = GoogleAdsService(user_credentials=credentials)
+    # Reuse (or create) the service instance for the user's credentials
+    service = _get_service(credentials)
     
     # Fetch accounts using user's auth
     accounts = service.get_accessible_accounts()
     
-    return _normalize_accounts(accounts)
+    return to_dicts(accounts)
 
 
 @mcp.tool
@@ -163,7 +178,7 @@ def get_account_summary(
         Dictionary with account performance metrics (impressions, clicks, cost, etc.)
     """
     credentials = _get_user_credentials(context)
-    service = GoogleAdsService(user_credentials=credentials)
+    service = _get_service(credentials)
     
     data = service.get_account_summary(customer_id, days)
     return data or {"message": f"No data found for account {customer_id}"}
@@ -188,10 +203,10 @@ def get_campaigns(
         List of campaign objects with performance metrics
     """
     credentials = _get_user_credentials(context)
-    service = GoogleAdsService(user_credentials=credentials)
+    service = _get_service(credentials)
     
     campaigns = service.get_campaigns(customer_id, days, limit)
-    return _normalize_accounts(campaigns)
+    return to_dicts(campaigns)
 
 
 @mcp.tool
@@ -215,10 +230,10 @@ def get_keywords(
         List of keyword objects with performance metrics
     """
     credentials = _get_user_credentials(context)
-    service = GoogleAdsService(user_credentials=credentials)
+    service = _get_service(credentials)
     
     keywords = service.get_keywords(customer_id, campaign_id, days, limit)
-    return _normalize_accounts(keywords)
+    return to_dicts(keywords)
 
 
 @mcp.tool
@@ -247,7 +262,7 @@ def get_auth_status(context: Context) -> Dict:
         pass
     
     # Check for environment variable fallback
-    if os.getenv("GOOGLE_ADS_REFRESH_TOKEN"):
+    if GOOGLE_ADS_REFRESH_TOKEN:
         return {
             "authenticated": True,
             "message": "Using environment variable credentials (fallback mode)",
@@ -305,15 +320,15 @@ GOOGLE CLOUD CONSOLE SETUP:
 @mcp.resource("google-ads://oauth-info")
 def oauth_info() -> str:
     """Information about the OAuth setup"""
-    base_url = os.getenv("FASTMCP_SERVER_AUTH_GOOGLE_BASE_URL", "http://localhost:7070")
-    client_id = os.getenv("FASTMCP_SERVER_AUTH_GOOGLE_CLIENT_ID", "not_set")
+    base_url = FASTMCP_GOOGLE_BASE_URL
+    client_id = FASTMCP_GOOGLE_CLIENT_ID or "not_set"
     
     return f"""
 OAuth Configuration Status:
 
 Base URL: {base_url}
 Client ID: {client_id[:20]}... (configured: {'✓' if client_id != 'not_set' else '✗'})
-Developer Token: {'✓ configured' if os.getenv('GOOGLE_ADS_DEVELOPER_TOKEN') else '✗ not set'}
+Developer Token: {'✓ configured' if GOOGLE_ADS_DEVELOPER_TOKEN else '✗ not set'}
 
 OAuth Flow URLs:
 - Login: {base_url}/auth/login
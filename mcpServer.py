@@ -1,30 +1,42 @@
 # mcp_server.py
 import sys
+import asyncio
+import hashlib
 import logging
 import os
-import json
+import tempfile
+import threading
+import fastjsonschema
+import msgspec
+import orjson
+from collections import defaultdict, deque
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
 from pathlib import Path
 from types import SimpleNamespace
+from cachetools import TTLCache
 
 # FastMCP + FastAPI + ASGI tools
+import fastmcp
 from fastmcp import FastMCP
 from fastmcp.server.auth.oauth_proxy import OAuthProxy
 from fastapi import FastAPI, Request
-from fastapi.responses import Response, JSONResponse
-from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+from fastapi.responses import ORJSONResponse, Response
+from starlette.concurrency import run_in_threadpool
 
 # Google libs
 import google.auth
-from google.cloud import firestore
-from google.cloud import secretmanager
 from google.api_core.exceptions import AlreadyExists, NotFound
+from google.ads.googleads.errors import GoogleAdsException
 
 # Local imports (project root)
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from core.services.google_ads_service import GoogleAdsService
 
 # Logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # GCP project detection
@@ -40,16 +52,50 @@ if not GOOGLE_OAUTH_CLIENT_ID or not GOOGLE_OAUTH_CLIENT_SECRET:
     logger.warning("Missing GOOGLE_OAUTH_CLIENT_ID / GOOGLE_OAUTH_CLIENT_SECRET. OAuth will be disabled.")
 
 # --- GCP lazy init (defensive - works even if GCP isn't configured locally) ---
-from typing import Optional
+# The Firestore / Secret Manager libraries pull in hundreds of proto modules;
+# import them only when a project is configured.
+from typing import TYPE_CHECKING, Dict, Optional
 from google.api_core.exceptions import PermissionDenied
 
-db: Optional[firestore.Client] = None
-secret_manager_client: Optional[secretmanager.SecretManagerServiceClient] = None
+if TYPE_CHECKING:
+    from google.cloud import firestore, secretmanager
+
+db: Optional["firestore.Client"] = None
+secret_manager_client: Optional["secretmanager.SecretManagerServiceClient"] = None
+
+# Keep the Secret Manager HTTP/2 connection warm between bursts instead of
+# re-handshaking after idle resets. (Firestore's client already pings every 30s.)
+_GRPC_KEEPALIVE_OPTIONS = [
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.http2.max_pings_without_data", 0),
+]
+
+def _firestore_client() -> "firestore.Client":
+    from google.cloud import firestore
+
+    return firestore.Client(project=GOOGLE_CLOUD_PROJECT)
+
+def _secret_manager_client() -> "secretmanager.SecretManagerServiceClient":
+    from google.cloud import secretmanager
+    from google.cloud.secretmanager_v1.services.secret_manager_service.transports import (
+        SecretManagerServiceGrpcTransport,
+    )
+
+    def keepalive_channel(host, *, options=(), **kwargs):
+        # Called by the transport with its credentials, scopes and size options
+        return SecretManagerServiceGrpcTransport.create_channel(
+            host, options=[*options, *_GRPC_KEEPALIVE_OPTIONS], **kwargs
+        )
+
+    return secretmanager.SecretManagerServiceClient(
+        transport=SecretManagerServiceGrpcTransport(channel=keepalive_channel)
+    )
 
 try:
     if GOOGLE_CLOUD_PROJECT:
-        db = firestore.Client(project=GOOGLE_CLOUD_PROJECT)
-        secret_manager_client = secretmanager.SecretManagerServiceClient()
+        db = _firestore_client()
+        secret_manager_client = _secret_manager_client()
         logger.info(f"✅ GCP initialized for project: {GOOGLE_CLOUD_PROJECT}")
     else:
         logger.warning("⚠️  GOOGLE_CLOUD_PROJECT not set; credential saving endpoints will be disabled.")
@@ -58,6 +104,26 @@ except Exception as e:
     db = None
     secret_manager_client = None
 
+# Index of the OAuthProxy kwargs shape this fastmcp version accepts (no secrets),
+# so later workers / restarts skip the trial-and-error
+_OAUTH_SHAPE_FILE = Path(tempfile.gettempdir()) / "mcpserver_oauth_shape.json"
+
+def _load_oauth_shape() -> Optional[int]:
+    try:
+        cached = orjson.loads(_OAUTH_SHAPE_FILE.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    if isinstance(cached, dict) and cached.get("fastmcp") == fastmcp.__version__:
+        shape = cached.get("shape")
+        return shape if isinstance(shape, int) else None
+    return None
+
+def _save_oauth_shape(shape: int) -> None:
+    try:
+        _OAUTH_SHAPE_FILE.write_bytes(orjson.dumps({"fastmcp": fastmcp.__version__, "shape": shape}))
+    except OSError as e:
+        logger.debug("Could not cache OAuthProxy shape: %s", e)
+
 # Build OAuthProxy (unchanged logic but no route appending yet)
 def build_oauth_proxy():
     auth_url  = "https://accounts.google.com/o/oauth2/v2/auth"
@@ -74,8 +140,9 @@ def build_oauth_proxy():
     )
     public_base = os.getenv("RENDER_EXTERNAL_URL", "http://127.0.0.1:7070").rstrip("/")
 
-    attempts = [
-        dict(
+    # Built lazily: usually only the first (or cached) shape is ever constructed
+    attempts = (
+        lambda: dict(
             upstream_authorization_endpoint=auth_url,
             upstream_token_endpoint=token_url,
             upstream_jwks_uri="https://www.googleapis.com/oauth2/v3/certs",
@@ -84,7 +151,7 @@ def build_oauth_proxy():
             default_scopes=scopes,
             require_authorization_consent=False,
         ),
-        dict(
+        lambda: dict(
             upstream_authorization_endpoint=auth_url,
             upstream_token_endpoint=token_url,
             client_id=GOOGLE_OAUTH_CLIENT_ID,
@@ -92,7 +159,7 @@ def build_oauth_proxy():
             default_scopes=scopes,
             require_authorization_consent=False,
         ),
-        dict(
+        lambda: dict(
             upstream_authorization_endpoint=auth_url,
             upstream_token_endpoint=token_url,
             upstream_client_id=GOOGLE_OAUTH_CLIENT_ID,
@@ -100,7 +167,7 @@ def build_oauth_proxy():
             base_url=public_base,
             default_scopes=scopes,
         ),
-        dict(
+        lambda: dict(
             upstream_authorization_endpoint=auth_url,
             upstream_token_endpoint=token_url,
             upstream_client_id=GOOGLE_OAUTH_CLIENT_ID,
@@ -109,7 +176,7 @@ def build_oauth_proxy():
             token_verifier=Verifier,
             default_scopes=scopes,
         ),
-        dict(
+        lambda: dict(
             upstream_authorization_endpoint=auth_url,
             upstream_token_endpoint=token_url,
             upstream_client_id=GOOGLE_OAUTH_CLIENT_ID,
@@ -117,15 +184,24 @@ def build_oauth_proxy():
             base_url=public_base,
             token_verifier=Verifier,
         ),
-    ]
+    )
+
+    # Try the shape that worked last time with this fastmcp version first
+    cached = _load_oauth_shape()
+    order = range(len(attempts))
+    if cached is not None and 0 <= cached < len(attempts):
+        order = [cached, *(i for i in order if i != cached)]
 
     last_exc = None
-    for kwargs in attempts:
+    for i in order:
         try:
-            return OAuthProxy(**kwargs)
+            proxy = OAuthProxy(**attempts[i]())
         except TypeError as e:
             last_exc = e
             continue
+        if i != cached:
+            _save_oauth_shape(i)
+        return proxy
 
     raise RuntimeError(f"Could not construct OAuthProxy for this fastmcp version: {last_exc}")
 
@@ -168,13 +244,105 @@ def store_token_in_secret_manager(user_id: str, refresh_token: str) -> Optional[
     logger.info(f"Added new version for secret {secret_id}: {version.name}")
     return version.name
 
-def write_user_to_firestore(user_id: str, email: str, profile: dict, secret_version_name: Optional[str]) -> None:
-    """Upserts the user document in Firestore."""
-    if not db:
-        logger.warning("Firestore client not initialized; skipping user write.")
-        return
-
-    doc = {
+# --- Firestore BulkWriter: concurrent /register writes share batched commits ---
+_BULK_FLUSH_INTERVAL = 0.25  # seconds
+_BULK_WRITE_TIMEOUT = 30
+_BULK_MAX_ATTEMPTS = 5
+# UNAVAILABLE, ABORTED, RESOURCE_EXHAUSTED, DEADLINE_EXCEEDED
+_BULK_RETRYABLE_CODES = frozenset({14, 10, 8, 4})
+_ALREADY_EXISTS_CODE = 6
+
+bulk_writer = None
+# Guards enqueue vs. flush on bulk_writer; callbacks take _bulk_pending_lock only
+_bulk_lock = threading.Lock()
+_bulk_pending_lock = threading.Lock()
+# Document path -> futures of the callers waiting on writes to it, oldest first
+_bulk_pending: Dict[str, deque] = defaultdict(deque)
+
+# Worker threads for blocking Google client calls (anyio's default is 40)
+_THREADPOOL_SIZE = 100
+
+def _bulk_settle(path: str) -> Optional[Future]:
+    with _bulk_pending_lock:
+        waiters = _bulk_pending.get(path)
+        if not waiters:
+            return None
+        fut = waiters.popleft()
+        if not waiters:
+            del _bulk_pending[path]
+        return fut
+
+def _on_bulk_write_result(reference, result, _writer) -> None:
+    fut = _bulk_settle(reference.path)
+    if fut:
+        fut.set_result(result)
+
+def _on_bulk_write_error(error, _writer) -> bool:
+    if error.code in _BULK_RETRYABLE_CODES and error.attempts < _BULK_MAX_ATTEMPTS:
+        return True
+    fut = _bulk_settle(error.operation.reference.path)
+    if fut:
+        if error.code == _ALREADY_EXISTS_CODE:
+            fut.set_exception(AlreadyExists(error.message))
+        else:
+            fut.set_exception(RuntimeError(f"Firestore write failed (code {error.code}): {error.message}"))
+    logger.warning("Firestore bulk write failed: code=%s %s", error.code, error.message)
+    return False
+
+def _bulk_write(writer, op: str, ref, data: dict, **kwargs) -> Future:
+    """Queue a BulkWriter create/set; the future resolves once the write is committed."""
+    fut = Future()
+    # Running futures can't be cancelled, so a caller timing out never leaves
+    # the callbacks setting a result on a cancelled future
+    fut.set_running_or_notify_cancel()
+    with _bulk_pending_lock:
+        _bulk_pending[ref.path].append(fut)
+    try:
+        with _bulk_lock:
+            getattr(writer, op)(ref, data, **kwargs)
+    except Exception:
+        with _bulk_pending_lock:
+            _bulk_pending[ref.path].remove(fut)
+        raise
+    return fut
+
+def _flush_bulk_writer(writer, close: bool = False) -> None:
+    with _bulk_lock:
+        if close:
+            writer.close()
+        else:
+            writer.flush()
+
+async def _bulk_flush_loop(writer) -> None:
+    while True:
+        await asyncio.sleep(_BULK_FLUSH_INTERVAL)
+        try:
+            await asyncio.to_thread(_flush_bulk_writer, writer)
+        except Exception as e:
+            logger.error(f"Firestore bulk flush failed: {e}")
+
+@asynccontextmanager
+async def lifespan(_app):
+    """Run the BulkWriter (and its flush loop) for the lifetime of the app."""
+    global bulk_writer
+    anyio.to_thread.current_default_thread_limiter().total_tokens = _THREADPOOL_SIZE
+    flusher = None
+    if db:
+        bulk_writer = db.bulk_writer()
+        bulk_writer.on_write_result(_on_bulk_write_result)
+        bulk_writer.on_write_error(_on_bulk_write_error)
+        flusher = asyncio.create_task(_bulk_flush_loop(bulk_writer))
+    try:
+        yield
+    finally:
+        if flusher:
+            flusher.cancel()
+            writer, bulk_writer = bulk_writer, None
+            await asyncio.to_thread(_flush_bulk_writer, writer, close=True)
+
+def _user_doc(email: str, profile: dict, secret_version_name: Optional[str]) -> dict:
+    from google.cloud import firestore  # already loaded when db is set
+    return {
         "email": email,
         "profile": profile or {},
         "providers": ["google"],
@@ -182,51 +350,134 @@ def write_user_to_firestore(user_id: str, email: str, profile: dict, secret_vers
         "auth": {"secret_version_name": secret_version_name} if secret_version_name else {},
         "updatedAt": firestore.SERVER_TIMESTAMP,
     }
+
+def write_user_to_firestore(user_id: str, email: str, profile: dict, secret_version_name: Optional[str]) -> None:
+    """Upserts the user document in Firestore."""
+    if not db:
+        logger.warning("Firestore client not initialized; skipping user write.")
+        return
+    from google.cloud import firestore
+
+    doc = _user_doc(email, profile, secret_version_name)
     
-    # Create if missing, then merge
+    # Create with createdAt; an existing doc gets a second (merge) write instead
     ref = db.collection("users").document(user_id)
-    if not ref.get().exists:
-        doc["createdAt"] = firestore.SERVER_TIMESTAMP
-    
-    ref.set(doc, merge=True)
+    created = {**doc, "createdAt": firestore.SERVER_TIMESTAMP}
+    writer = bulk_writer
+    if writer is None:
+        try:
+            ref.create(created)
+        except AlreadyExists:
+            ref.set(doc, merge=True)
+    else:
+        try:
+            _bulk_write(writer, "create", ref, created).result(timeout=_BULK_WRITE_TIMEOUT)
+        except AlreadyExists:
+            _bulk_write(writer, "set", ref, doc, merge=True).result(timeout=_BULK_WRITE_TIMEOUT)
     logger.info(f"User {user_id} upserted in Firestore (has token: {bool(secret_version_name)})")
 
+async def write_user_to_firestore_async(
+    user_id: str, email: str, profile: dict, secret_version_name: Optional[str]
+) -> None:
+    """write_user_to_firestore for async callers: the wait for the BulkWriter
+    commit happens on the event loop, not in a parked worker thread."""
+    writer = bulk_writer
+    if writer is None:
+        await run_in_threadpool(write_user_to_firestore, user_id, email, profile, secret_version_name)
+        return
+    from google.cloud import firestore
+
+    doc = _user_doc(email, profile, secret_version_name)
+    ref = db.collection("users").document(user_id)
+    created = {**doc, "createdAt": firestore.SERVER_TIMESTAMP}
+
+    async def commit(op: str, data: dict, **kwargs) -> None:
+        # Enqueueing can wait on a running flush, so it stays off the loop
+        fut = await run_in_threadpool(_bulk_write, writer, op, ref, data, **kwargs)
+        await asyncio.wait_for(asyncio.wrap_future(fut), _BULK_WRITE_TIMEOUT)
+
+    try:
+        await commit("create", created)
+    except AlreadyExists:
+        await commit("set", doc, merge=True)
+    logger.info(f"User {user_id} upserted in Firestore (has token: {bool(secret_version_name)})")
+
+# Decoded refresh tokens per secret_version_name; tokens rotate rarely, and a
+# rotation adds a new version (a new key) anyway. Misses are never cached.
+_SECRET_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=600)
+_SECRET_CACHE_LOCK = threading.Lock()
+
+def _read_refresh_token(secret_version_name: str) -> str:
+    with _SECRET_CACHE_LOCK:
+        token = _SECRET_CACHE.get(secret_version_name)
+    if token is None:
+        response = secret_manager_client.access_secret_version(request={"name": secret_version_name})
+        # OAuth refresh tokens are plain ASCII; skip the UTF-8 decoder
+        token = response.payload.data.decode("ascii")
+        with _SECRET_CACHE_LOCK:
+            _SECRET_CACHE[secret_version_name] = token
+    return token
+
+# Authenticated services (and their gRPC channels) keyed by a hash of the token,
+# expiring shortly before the one-hour access-token lifetime.
+_SERVICE_CACHE: TTLCache = TTLCache(maxsize=512, ttl=3300)
+_SERVICE_CACHE_LOCK = threading.Lock()
+
+def _get_service(kind: str, token: str) -> GoogleAdsService:
+    """Return a cached GoogleAdsService for {kind: token}, building it on first use."""
+    key = hashlib.blake2b(f"{kind}|{token}".encode(), digest_size=16).hexdigest()
+    with _SERVICE_CACHE_LOCK:
+        service = _SERVICE_CACHE.get(key)
+    if service is None:
+        service = GoogleAdsService(user_credentials={kind: token})
+        with _SERVICE_CACHE_LOCK:
+            service = _SERVICE_CACHE.setdefault(key, service)
+    return service
+
 def get_ads_service_from_auth(auth: dict) -> GoogleAdsService:
     if not auth:
         raise RuntimeError("No auth provided by client.")
     if "refresh_token" in auth:
-        return GoogleAdsService(user_credentials={"refresh_token": auth["refresh_token"]})
+        return _get_service("refresh_token", auth["refresh_token"])
     if "access_token" in auth:
-        return GoogleAdsService(user_credentials={"access_token": auth["access_token"]})
+        return _get_service("access_token", auth["access_token"])
     if "secret_version_name" in auth:
         try:
-            response = secret_manager_client.access_secret_version(request={"name": auth["secret_version_name"]})
-            refresh_token = response.payload.data.decode("UTF-8")
-            return GoogleAdsService(user_credentials={"refresh_token": refresh_token})
+            refresh_token = _read_refresh_token(auth["secret_version_name"])
+            return _get_service("refresh_token", refresh_token)
         except NotFound:
             raise FileNotFoundError("Could not find the stored credential in Secret Manager.")
         except Exception as e:
             raise ConnectionError(f"Failed to retrieve user credentials: {e}")
     raise RuntimeError("Unsupported auth payload: expected access_token, refresh_token, or secret_version_name.")
 
+def _ads_error(prefix: str, ex: GoogleAdsException) -> RuntimeError:
+    """Build a compact error from a GoogleAdsException (status, first error, request id)."""
+    errors = ex.failure.errors
+    detail = f": {errors[0].message}" if errors else ""
+    return RuntimeError(f"{prefix}: {ex.error.code().name}{detail} (request_id={ex.request_id})")
+
 # --- Define raw tool functions (these are the actual callables) ---
+# Only Google Ads API failures are translated; auth errors (FileNotFoundError,
+# ConnectionError, ...) keep their own type. Secret Manager and Google Ads calls
+# block, so they run in the threadpool and batched calls overlap.
 async def list_accessible_accounts(auth: dict) -> list[dict]:
     """List all Google Ads accounts the authenticated user can access."""
+    service = await run_in_threadpool(get_ads_service_from_auth, auth)
     try:
-        service = get_ads_service_from_auth(auth)
-        accounts = service.get_accessible_accounts()
-        return [acc.__dict__ for acc in accounts]
-    except Exception as e:
-        raise RuntimeError(str(e))
+        accounts = await run_in_threadpool(service.get_accessible_accounts)
+    except GoogleAdsException as ex:
+        raise _ads_error("Failed to list accounts", ex) from ex
+    return [acc.__dict__ for acc in accounts]
 
 async def get_account_summary(auth: dict, customer_id: str, days: int = 30) -> dict:
     """Get performance summary (spend, clicks, conversions) for a Google Ads account over the specified number of days."""
+    service = await run_in_threadpool(get_ads_service_from_auth, auth)
     try:
-        service = get_ads_service_from_auth(auth)
-        summary = service.get_account_summary(customer_id, days)
-        return summary or {"message": f"No data found for account {customer_id}"}
-    except Exception as e:
-        raise RuntimeError(str(e))
+        summary = await run_in_threadpool(service.get_account_summary, customer_id, days)
+    except GoogleAdsException as ex:
+        raise _ads_error("Failed to get account summary", ex) from ex
+    return summary or {"message": f"No data found for account {customer_id}"}
 
 # --- Build registry with raw callables BEFORE decoration ---
 TOOL_REGISTRY = {
@@ -238,49 +489,53 @@ TOOL_REGISTRY = {
 mcp.tool()(list_accessible_accounts)
 mcp.tool()(get_account_summary)
 
-# Rich JSON Schemas so clients like Claude can render proper forms
+# Rich JSON Schemas so clients like Claude can render proper forms.
+# Both tools take the same auth object, so it is defined once under $defs.
+_AUTH_DEF = {
+    "title": "Authentication",
+    "type": "object",
+    "oneOf": [
+        {
+            "title": "Refresh token",
+            "type": "object",
+            "properties": {
+                "refresh_token": {"type": "string", "minLength": 10}
+            },
+            "required": ["refresh_token"],
+            "additionalProperties": False
+        },
+        {
+            "title": "Access token",
+            "type": "object",
+            "properties": {
+                "access_token": {"type": "string", "minLength": 10}
+            },
+            "required": ["access_token"],
+            "additionalProperties": False
+        },
+        {
+            "title": "Secret Manager ref",
+            "type": "object",
+            "properties": {
+                "secret_version_name": {
+                    "type": "string",
+                    "pattern": r"^projects\/[^\/]+\/secrets\/[^\/]+\/versions\/(latest|\d+)$"
+                }
+            },
+            "required": ["secret_version_name"],
+            "additionalProperties": False
+        }
+    ]
+}
+
 TOOL_SCHEMAS = {
     "list_accessible_accounts": {
         "$schema": "https://json-schema.org/draft/2020-12/schema",
         "title": "List Accessible Accounts",
         "type": "object",
+        "$defs": {"Auth": _AUTH_DEF},
         "properties": {
-            "auth": {
-                "title": "Authentication",
-                "type": "object",
-                "oneOf": [
-                    {
-                        "title": "Refresh token",
-                        "type": "object",
-                        "properties": {
-                            "refresh_token": {"type": "string", "minLength": 10}
-                        },
-                        "required": ["refresh_token"],
-                        "additionalProperties": False
-                    },
-                    {
-                        "title": "Access token",
-                        "type": "object",
-                        "properties": {
-                            "access_token": {"type": "string", "minLength": 10}
-                        },
-                        "required": ["access_token"],
-                        "additionalProperties": False
-                    },
-                    {
-                        "title": "Secret Manager ref",
-                        "type": "object",
-                        "properties": {
-                            "secret_version_name": {
-                                "type": "string",
-                                "pattern": r"^projects\/[^\/]+\/secrets\/[^\/]+\/versions\/(latest|\d+)$"
-                            }
-                        },
-                        "required": ["secret_version_name"],
-                        "additionalProperties": False
-                    }
-                ]
-            }
+            "auth": {"$ref": "#/$defs/Auth"}
         },
         "required": ["auth"],
         "additionalProperties": False
@@ -289,43 +544,9 @@ TOOL_SCHEMAS = {
         "$schema": "https://json-schema.org/draft/2020-12/schema",
         "title": "Get Account Summary",
         "type": "object",
+        "$defs": {"Auth": _AUTH_DEF},
         "properties": {
-            "auth": {
-                "title": "Authentication",
-                "type": "object",
-                "oneOf": [
-                    {
-                        "title": "Refresh token",
-                        "type": "object",
-                        "properties": {
-                            "refresh_token": {"type": "string", "minLength": 10}
-                        },
-                        "required": ["refresh_token"],
-                        "additionalProperties": False
-                    },
-                    {
-                        "title": "Access token",
-                        "type": "object",
-                        "properties": {
-                            "access_token": {"type": "string", "minLength": 10}
-                        },
-                        "required": ["access_token"],
-                        "additionalProperties": False
-                    },
-                    {
-                        "title": "Secret Manager ref",
-                        "type": "object",
-                        "properties": {
-                            "secret_version_name": {
-                                "type": "string",
-                                "pattern": r"^projects\/[^\/]+\/secrets\/[^\/]+\/versions\/(latest|\d+)$"
-                            }
-                        },
-                        "required": ["secret_version_name"],
-                        "additionalProperties": False
-                    }
-                ]
-            },
+            "auth": {"$ref": "#/$defs/Auth"},
             "customer_id": {
                 "title": "Customer ID",
                 "type": "string",
@@ -345,6 +566,22 @@ TOOL_SCHEMAS = {
     }
 }
 
+# Registry and schemas are fixed after import, so tools/list is built (and encoded) once
+_TOOLS_LIST_RESULT = {
+    "tools": [
+        {
+            "name": name,
+            "description": (fn.__doc__ or f"Google Ads tool: {name}").strip(),
+            "inputSchema": TOOL_SCHEMAS.get(name, {"type": "object"}),
+        }
+        for name, fn in TOOL_REGISTRY.items()
+    ]
+}
+_TOOLS_LIST_JSON = orjson.dumps(_TOOLS_LIST_RESULT)
+
+# Argument validators compiled to Python once (patterns included), not per call
+_VALIDATORS = {name: fastjsonschema.compile(schema) for name, schema in TOOL_SCHEMAS.items()}
+
 # Log the initialized tools and schemas
 logger.info("🔧 TOOL REGISTRY INITIALIZED: %s", list(TOOL_REGISTRY.keys()))
 logger.info("🔧 TOOL SCHEMAS INITIALIZED: %s", list(TOOL_SCHEMAS.keys()))
@@ -352,8 +589,7 @@ logger.info("🔧 TOOL SCHEMAS INITIALIZED: %s", list(TOOL_SCHEMAS.keys()))
 # --- Main FastAPI app (no FastMCP HTTP wiring needed - we use direct JSON-RPC shim) ---
 from typing import Optional, Any, Dict
 
-app = FastAPI()
-app.add_middleware(ProxyHeadersMiddleware, trusted_hosts="*")
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Add OAuth routes
 for route in oauth.get_routes(mcp_path="/"):
@@ -365,6 +601,13 @@ from fastapi import HTTPException
 def _jsonrpc_ok(id_val: Any, result: Any) -> Dict[str, Any]:
     return {"jsonrpc": "2.0", "id": id_val, "result": result}
 
+class _JsonRpcError(Exception):
+    """Raised by handlers to answer with a JSON-RPC error object"""
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
 def _jsonrpc_err(id_val: Any, code: int, message: str, data: Any = None) -> Dict[str, Any]:
     err = {"code": code, "message": message}
     if data is not None:
@@ -390,30 +633,13 @@ async def _handle_initialize(params: Dict[str, Any]) -> Dict[str, Any]:
 
 async def _handle_tools_list() -> Dict[str, Any]:
     """Handle tools/list request"""
-    logger.info("🔧 TOOLS LIST: Starting tools list generation")
-    logger.info("TOOL_REGISTRY keys: %s", list(TOOL_REGISTRY.keys()))
-    logger.info("TOOL_SCHEMAS keys: %s", list(TOOL_SCHEMAS.keys()))
-    
-    tools = []
-    for name, fn in TOOL_REGISTRY.items():
-        logger.info("Processing tool: %s", name)
-        logger.info("Function: %s", fn)
-        logger.info("Function doc: %s", fn.__doc__)
-        
-        schema = TOOL_SCHEMAS.get(name, {"type": "object"})
-        logger.info("Schema for %s: %s", name, schema)
-        
-        tool_def = {
-            "name": name,
-            "description": (fn.__doc__ or f"Google Ads tool: {name}").strip(),
-            "inputSchema": schema
-        }
-        tools.append(tool_def)
-        logger.info("Added tool: %s", tool_def)
-    
-    logger.info("🔧 TOOLS LIST: serving %d tools: %s", len(tools), [t["name"] for t in tools])
-    logger.info("Full tools response: %s", tools)
-    return {"tools": tools}
+    logger.debug("🔧 TOOLS LIST: serving %d tools", len(_TOOLS_LIST_RESULT["tools"]))
+    return _TOOLS_LIST_RESULT
+
+def _tools_list_response(id_val: Any) -> Response:
+    """Full JSON-RPC tools/list response, spliced around the pre-encoded result"""
+    body = b'{"jsonrpc":"2.0","id":' + orjson.dumps(id_val) + b',"result":' + _TOOLS_LIST_JSON + b"}"
+    return Response(body, media_type="application/json")
 
 async def _handle_tools_call(params: Dict[str, Any]) -> Any:
     """Handle tools/call request"""
@@ -430,11 +656,20 @@ async def _handle_tools_call(params: Dict[str, Any]) -> Any:
     
     if not isinstance(arguments, dict):
         raise HTTPException(status_code=400, detail="Tool arguments must be an object")
+
+    validate = _VALIDATORS.get(name)
+    if validate:
+        try:
+            # Also fills in schema defaults (e.g. days=30)
+            arguments = validate(arguments)
+        except fastjsonschema.JsonSchemaValueException as e:
+            raise _JsonRpcError(-32602, f"Invalid params: {e.message}", {"path": e.name}) from e
     
     # All our tools are async
-    logger.info("Calling tool: %s with args: %s", name, list(arguments.keys()))
+    logger.debug("Calling tool: %s with args: %s", name, list(arguments))
     result = await fn(**arguments)
-    return {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]}
+    text = orjson.dumps(result, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return {"content": [{"type": "text", "text": text}]}
 
 async def _dispatch_jsonrpc(req: Dict[str, Any]) -> Dict[str, Any]:
     """Dispatch a single JSON-RPC request"""
@@ -442,151 +677,120 @@ async def _dispatch_jsonrpc(req: Dict[str, Any]) -> Dict[str, Any]:
     method = req.get("method")
     params = req.get("params") or {}
     
-    logger.info("🚀 DISPATCH: method=%s, id=%s, params=%s", method, id_val, params)
+    logger.debug("🚀 DISPATCH: method=%s, id=%s", method, id_val)
 
     if method == "initialize":
-        logger.info("📋 Handling initialize request")
-        result = await _handle_initialize(params)
-        logger.info("Initialize result: %s", result)
-        return _jsonrpc_ok(id_val, result)
+        return _jsonrpc_ok(id_val, await _handle_initialize(params))
 
     if method in ("tools/list", "tools.list"):
-        logger.info("🔧 Handling tools/list request")
-        result = await _handle_tools_list()
-        logger.info("Tools list result: %s", result)
-        return _jsonrpc_ok(id_val, result)
+        return _jsonrpc_ok(id_val, await _handle_tools_list())
 
     if method in ("tools/call", "tools.call"):
-        logger.info("⚡ Handling tools/call request")
-        result = await _handle_tools_call(params)
-        logger.info("Tools call result: %s", result)
-        return _jsonrpc_ok(id_val, result)
+        try:
+            return _jsonrpc_ok(id_val, await _handle_tools_call(params))
+        except _JsonRpcError as e:
+            return _jsonrpc_err(id_val, e.code, str(e), e.data)
 
     logger.warning("❌ UNKNOWN METHOD: %s", method)
-    error = _jsonrpc_err(id_val, -32601, f"Method not found: {method}")
-    logger.info("Error response: %s", error)
-    return error
+    return _jsonrpc_err(id_val, -32601, f"Method not found: {method}")
 
 # --- JSON-RPC HTTP endpoints (all paths supported) ---
 def _is_notification(msg: dict) -> bool:
     return isinstance(msg, dict) and msg.get("id") is None
 
-@app.post("/")
+# Claude web expects HTTP 200 with empty JSON (not 204) for notifications.
+# The response is static, so one instance serves every notification.
+_EMPTY_RESPONSE = ORJSONResponse({})
+
+# Every path clients are known to POST JSON-RPC to
+_JSONRPC_PATHS = ("/", "/rpc", "/rpc/", "/mcp", "/mcp/")
+
 async def jsonrpc_root(request: Request):
     """Main JSON-RPC endpoint"""
-    logger.info("=== JSON-RPC REQUEST START ===")
-    logger.info("Request URL: %s", request.url)
-    logger.info("Request headers: %s", dict(request.headers))
-    
-    payload = await request.json()
-    logger.info("Raw payload: %s", payload)
-    logger.info("Payload type: %s", type(payload))
+    # Nothing to parse or answer for an empty body
+    if request.headers.get("content-length") == "0":
+        return _EMPTY_RESPONSE
+
+    payload = orjson.loads(await request.body())
 
     # Single request
     if isinstance(payload, dict):
         method = payload.get("method")
         id_val = payload.get("id")
-        logger.info("Single request - method: %s, id: %s", method, id_val)
         
         # Special-case: Claude sends a JSON-RPC notification after initialize.
-        # Claude web expects HTTP 200 with empty body, not 204
         if _is_notification(payload):
-            logger.info("🔔 NOTIFICATION DETECTED: method=%s (no id field)", method)
-            logger.info("Returning empty JSON response for Claude web compatibility")
-            # Claude web expects HTTP 200 with empty JSON, not 204
-            response = JSONResponse({})
-            logger.info("Response: %s", response)
-            return response
-
-        logger.info("📞 REGULAR REQUEST: method=%s, id=%s", method, id_val)
-        result = await _dispatch_jsonrpc(payload)
-        logger.info("Dispatch result: %s", result)
-        response = JSONResponse(result)
-        logger.info("Final response: %s", response)
-        return response
+            logger.debug("🔔 NOTIFICATION: method=%s (no id field)", method)
+            return _EMPTY_RESPONSE
+
+        logger.debug("📞 REQUEST: method=%s, id=%s", method, id_val)
+        if method in ("tools/list", "tools.list"):
+            return _tools_list_response(id_val)
+        return ORJSONResponse(await _dispatch_jsonrpc(payload))
 
     # Batch requests
     if isinstance(payload, list):
-        logger.info("📦 BATCH REQUEST with %d items", len(payload))
-        responses = []
-        only_notifications = True
-        for i, req in enumerate(payload):
-            logger.info("Batch item %d: %s", i, req)
-            if _is_notification(req):
-                logger.info("🔔 Notification in batch: method=%s", req.get("method"))
-                continue
-            only_notifications = False
-            logger.info("📞 Regular request in batch: method=%s, id=%s", req.get("method"), req.get("id"))
-            responses.append(await _dispatch_jsonrpc(req))
+        logger.debug("📦 BATCH REQUEST with %d items", len(payload))
+        requests = [req for req in payload if not _is_notification(req)]
         
         # If the whole batch was notifications, return 200 with empty array (Claude-friendly)
-        if only_notifications:
-            logger.info("All batch items were notifications, returning empty array")
-            return JSONResponse([], status_code=200)
+        if not requests:
+            return ORJSONResponse([], status_code=200)
         
-        logger.info("Batch responses: %s", responses)
-        return JSONResponse(responses)
+        # Tool calls are independent I/O: run them together, answers stay in request order
+        results = await asyncio.gather(*map(_dispatch_jsonrpc, requests), return_exceptions=True)
+        responses = [
+            _jsonrpc_err(req.get("id"), -32603, str(res)) if isinstance(res, BaseException) else res
+            for req, res in zip(requests, results)
+        ]
+        return ORJSONResponse(responses)
 
     # Invalid payload
-    logger.warning("❌ INVALID PAYLOAD: type=%s, value=%s", type(payload), payload)
-    error_response = _jsonrpc_err(None, -32600, "Invalid Request")
-    logger.info("Error response: %s", error_response)
-    return JSONResponse(error_response)
-
-@app.post("/rpc")
-async def jsonrpc_rpc(request: Request):
-    return await jsonrpc_root(request)
+    logger.warning("❌ INVALID PAYLOAD: type=%s", type(payload).__name__)
+    return ORJSONResponse(_jsonrpc_err(None, -32600, "Invalid Request"))
 
-@app.post("/rpc/")
-async def jsonrpc_rpc_slash(request: Request):
-    return await jsonrpc_root(request)
-
-@app.post("/mcp")
-async def jsonrpc_mcp(request: Request):
-    return await jsonrpc_root(request)
-
-@app.post("/mcp/")
-async def jsonrpc_mcp_slash(request: Request):
-    return await jsonrpc_root(request)
+# One handler on all paths, instead of per-path wrappers awaiting jsonrpc_root
+for _path in _JSONRPC_PATHS:
+    app.add_api_route(_path, jsonrpc_root, methods=["POST"])
 
 # --- User Registration Endpoint ---
-from pydantic import BaseModel, Field
 from fastapi import HTTPException
 
-class RegisterBody(BaseModel):
-    user_id: str = Field(..., description="Your app's user id (e.g., Firebase uid)")
+class RegisterBody(msgspec.Struct):
+    # Decoded and validated in one pass by msgspec (C), bypassing FastAPI's
+    # Pydantic body handling; unknown fields are ignored as before.
+    user_id: str  # Your app's user id (e.g., Firebase uid)
     email: str
-    profile: dict = Field(default_factory=dict)  # name, picture, etc.
+    profile: dict = {}  # name, picture, etc. (msgspec copies empty defaults)
     # either send refresh_token (server will store & return secret_version_name)
     refresh_token: Optional[str] = None
     # or, if you already stored it earlier, send the secret reference directly
     secret_version_name: Optional[str] = None
 
 @app.post("/register")
-def register_user(body: RegisterBody):
+async def register_user(request: Request):
     """
     Register/update a user in Firestore after OAuth.
     Optionally stores refresh token in Secret Manager.
     """
+    try:
+        body = msgspec.json.decode(await request.body(), type=RegisterBody)
+    except msgspec.DecodeError as e:  # includes ValidationError
+        raise HTTPException(status_code=422, detail=str(e))
     logger.info(f"Registration request for user: {body.user_id} ({body.email})")
     
     # Simple validation
     if not (body.refresh_token or body.secret_version_name):
         # Allow creating a bare user doc without token if needed
         logger.info("Register without token: creating bare user doc.")
-        write_user_to_firestore(body.user_id, body.email, body.profile, None)
+        await write_user_to_firestore_async(body.user_id, body.email, body.profile, None)
         return {"ok": True, "stored": False, "message": "User created without Ads token."}
 
     # If a refresh_token is provided, store it and get a secret reference
     svn = body.secret_version_name
     if body.refresh_token:
         try:
-            svn = store_token_in_secret_manager(body.user_id, body.refresh_token)
-            if not svn:
-                raise HTTPException(
-                    status_code=503,
-                    detail="Secret Manager not available. Check GCP configuration."
-                )
+            svn = await run_in_threadpool(store_token_in_secret_manager, body.user_id, body.refresh_token)
         except PermissionDenied as e:
             raise HTTPException(
                 status_code=403,
@@ -598,10 +802,15 @@ def register_user(body: RegisterBody):
                 status_code=500,
                 detail=f"Failed to store refresh token: {str(e)}"
             )
+        if not svn:
+            raise HTTPException(
+                status_code=503,
+                detail="Secret Manager not available. Check GCP configuration."
+            )
 
     # Write the user doc with the secret ref
     try:
-        write_user_to_firestore(body.user_id, body.email, body.profile, svn)
+        await write_user_to_firestore_async(body.user_id, body.email, body.profile, svn)
     except Exception as e:
         logger.exception("Failed to write Firestore user")
         raise HTTPException(
@@ -618,77 +827,104 @@ def register_user(body: RegisterBody):
     }
 
 # --- Basic GET endpoints ---
-@app.get("/")
-def root_info():
-    return {
-        "name": "Google Ads MCP Server",
-        "version": "1.0",
-        "status": "running",
-        "transport": "Direct JSON-RPC (bypasses FastMCP HTTP)",
-        "mcp_endpoints": ["POST /", "POST /rpc", "POST /rpc/", "POST /mcp", "POST /mcp/"],
-        "tools": list(TOOL_REGISTRY.keys()),
-        "endpoints": {
-            "health": "GET /health",
-            "debug": "GET /debug",
-            "tools": "GET /tools",
-            "register": "POST /register",
-            "oauth": "GET /.well-known/oauth-authorization-server"
-        },
-        "gcp": {
-            "firestore": db is not None,
-            "secret_manager": secret_manager_client is not None,
-            "project": GOOGLE_CLOUD_PROJECT
-        }
+# Everything these report is fixed once the module has loaded, so each body is
+# encoded once and served as a prebuilt response (they are polled by uptime
+# checks and load balancers).
+def _static_json(data: Any) -> Response:
+    return Response(orjson.dumps(data), media_type="application/json")
+
+_ROOT_INFO_RESPONSE = _static_json({
+    "name": "Google Ads MCP Server",
+    "version": "1.0",
+    "status": "running",
+    "transport": "Direct JSON-RPC (bypasses FastMCP HTTP)",
+    "mcp_endpoints": [f"POST {p}" for p in _JSONRPC_PATHS],
+    "tools": list(TOOL_REGISTRY.keys()),
+    "endpoints": {
+        "health": "GET /health",
+        "debug": "GET /debug",
+        "tools": "GET /tools",
+        "register": "POST /register",
+        "oauth": "GET /.well-known/oauth-authorization-server"
+    },
+    "gcp": {
+        "firestore": db is not None,
+        "secret_manager": secret_manager_client is not None,
+        "project": GOOGLE_CLOUD_PROJECT
     }
+})
 
-@app.get("/health")
-def health():
-    return {"ok": True, "mcp_active": True, "oauth_proxy": "enabled"}
+_HEALTH_RESPONSE = _static_json({"ok": True, "mcp_active": True, "oauth_proxy": "enabled"})
 
-@app.get("/debug")
-def debug_info():
-    """Debug endpoint showing registered tools and schemas"""
-    tools_list = []
-    for name, fn in TOOL_REGISTRY.items():
-        tools_list.append({
+_DEBUG_RESPONSE = _static_json({
+    "status": "ok",
+    "transport": "Direct JSON-RPC shim",
+    "available_tools": [
+        {
             "name": name,
             "description": fn.__doc__ or "",
             "schema": TOOL_SCHEMAS.get(name, {})
-        })
-    
-    return {
-        "status": "ok",
-        "transport": "Direct JSON-RPC shim",
-        "available_tools": tools_list,
-        "tool_count": len(TOOL_REGISTRY),
-        "server_info": {
-            "name": "Google Ads MCP Server",
-            "version": "1.0"
         }
+        for name, fn in TOOL_REGISTRY.items()
+    ],
+    "tool_count": len(TOOL_REGISTRY),
+    "server_info": {
+        "name": "Google Ads MCP Server",
+        "version": "1.0"
     }
+})
 
-@app.get("/tools")
-def list_tools():
-    """Quick debug endpoint to see tool registry status"""
-    tools_info = []
-    for name, fn in TOOL_REGISTRY.items():
-        schema = TOOL_SCHEMAS.get(name, {})
-        tools_info.append({
+_TOOLS_RESPONSE = _static_json({
+    "count": len(TOOL_REGISTRY),
+    "tools": [
+        {
             "name": name,
             "description": fn.__doc__ or "",
             "has_schema": name in TOOL_SCHEMAS,
-            "schema_keys": list(schema.keys()) if isinstance(schema, dict) else [],
+            "schema_keys": list(TOOL_SCHEMAS.get(name, {})),
             "function": str(fn)
-        })
-    
-    return {
-        "count": len(TOOL_REGISTRY),
-        "tools": tools_info,
-        "registry_keys": list(TOOL_REGISTRY.keys()),
-        "schema_keys": list(TOOL_SCHEMAS.keys())
-    }
+        }
+        for name, fn in TOOL_REGISTRY.items()
+    ],
+    "registry_keys": list(TOOL_REGISTRY),
+    "schema_keys": list(TOOL_SCHEMAS)
+})
+
+@app.get("/")
+async def root_info():
+    return _ROOT_INFO_RESPONSE
+
+@app.get("/health")
+async def health():
+    return _HEALTH_RESPONSE
+
+@app.get("/debug")
+async def debug_info():
+    """Debug endpoint showing registered tools and schemas"""
+    return _DEBUG_RESPONSE
+
+@app.get("/tools")
+async def list_tools():
+    """Quick debug endpoint to see tool registry status"""
+    return _TOOLS_RESPONSE
 
 # Run server
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", "7070")), reload=True)
+    # reload is for local development only: it runs a file watcher and forces
+    # a single worker. Workers need the import string form of the app.
+    # "auto" picks uvloop + httptools when installed (uvicorn[standard]).
+    uvicorn.run(
+        "mcpServer:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "7070")),
+        reload=os.getenv("RELOAD", "0") == "1",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="auto",
+        http="auto",
+        # Render terminates TLS in front of us; trust X-Forwarded-* so
+        # request.url uses the public scheme and host. Only localhost by
+        # default; set FORWARDED_ALLOW_IPS="*" behind Render's proxy.
+        proxy_headers=True,
+        forwarded_allow_ips=os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+    )
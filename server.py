@@ -1,6 +1,15 @@
 import os
+import abc
+import asyncio
+import hashlib
+import json
 import logging
-from typing import List, Dict, Optional, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, NamedTuple, Optional, Set, Tuple
+
+from cachetools import LRUCache, TTLCache
 
 from fastmcp import FastMCP, Context
 from fastmcp.server.auth.providers.google import GoogleProvider
@@ -56,7 +65,65 @@ mcp = FastMCP(name="Google Ads Connector", auth=auth_provider)
 # ─────────────────────────────────────────────────────────────────────────────
 # Token & Pref Stores (fallbacks only; prefer provider-managed tokens)
 # ─────────────────────────────────────────────────────────────────────────────
-_user_prefs: dict[str, dict] = {}  # {user_sub: {"default_customer_id": "1234567890"}}
+# Prefs survive restarts so users don't have to re-run set_default_account
+class PrefStore(abc.ABC):
+    """Per-user preferences, e.g. {user_sub: {"default_customer_id": "1234567890"}}."""
+
+    @abc.abstractmethod
+    def get(self, user_key: str, field: str) -> Optional[str]:
+        ...
+
+    @abc.abstractmethod
+    def set(self, user_key: str, field: str, value: str) -> None:
+        ...
+
+class FilePrefStore(PrefStore):
+    """One JSON file, loaded at startup and rewritten atomically on each set."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, "rb") as f:
+                self._prefs: dict[str, dict] = json.load(f)
+        except FileNotFoundError:
+            self._prefs = {}
+        except ValueError:
+            logger.warning("Ignoring unreadable prefs file %s", path)
+            self._prefs = {}
+
+    def get(self, user_key: str, field: str) -> Optional[str]:
+        return self._prefs.get(user_key, {}).get(field)
+
+    def set(self, user_key: str, field: str, value: str) -> None:
+        with self._lock:
+            self._prefs.setdefault(user_key, {})[field] = value
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._prefs, f)
+            os.replace(tmp, self.path)
+
+class RedisPrefStore(PrefStore):
+    """A user_prefs:{sub} hash per user; shared by every worker and instance."""
+
+    def __init__(self, url: str):
+        import redis  # optional; only needed with PREFS_BACKEND=redis
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+
+    def get(self, user_key: str, field: str) -> Optional[str]:
+        return self._redis.hget(f"user_prefs:{user_key}", field)
+
+    def set(self, user_key: str, field: str, value: str) -> None:
+        self._redis.hset(f"user_prefs:{user_key}", field, value)
+
+def _build_pref_store() -> PrefStore:
+    backend = os.environ.get("PREFS_BACKEND", "file").lower()
+    if backend == "redis":
+        return RedisPrefStore(os.environ.get("REDIS_URL", "redis://localhost:6379/0"))
+    return FilePrefStore(os.environ.get("PREFS_PATH") or os.path.expanduser("~/.gads_mcp/prefs.json"))
+
+_prefs = _build_pref_store()
 
 def _get_user_key(ctx: Context) -> str:
     if not ctx or not getattr(ctx, "user", None):
@@ -65,56 +132,50 @@ def _get_user_key(ctx: Context) -> str:
     return claims.get("sub") or claims.get("email") or "unknown"
 
 def _set_default_customer_id(ctx: Context, customer_id: str) -> None:
-    user_key = _get_user_key(ctx)
-    _user_prefs.setdefault(user_key, {})["default_customer_id"] = customer_id.replace("-", "")
+    _prefs.set(_get_user_key(ctx), "default_customer_id", customer_id.replace("-", ""))
 
 def _get_default_customer_id(ctx: Context) -> Optional[str]:
-    user_key = _get_user_key(ctx)
-    return _user_prefs.get(user_key, {}).get("default_customer_id")
+    return _prefs.get(_get_user_key(ctx), "default_customer_id")
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Provider-managed token retrieval (preferred)
-# Tries several common access points depending on FastMCP minor version.
-# If not available, raises a single, clear message.
+# Tries several common access points depending on FastMCP minor version, once
+# at import. If none is available, raises a single, clear message per call.
 # ─────────────────────────────────────────────────────────────────────────────
-def _get_tokens(ctx: Context) -> Tuple[str, Optional[str]]:
-    sub = _get_user_key(ctx)
-
-    # Try common places for the auth provider instance
-    provider = None
-    # FastMCP sometimes exposes the provider here:
-    if hasattr(mcp, "auth"):
-        provider = getattr(mcp, "auth")
-    # Or current() if the framework exposes it (safe to try)
-    if not provider and hasattr(FastMCP, "current"):
-        cur = FastMCP.current()
-        if cur and hasattr(cur, "auth"):
-            provider = cur.auth
-
-    # Known helper name in many 2.x builds
-    if provider and hasattr(provider, "get_tokens_for_subject"):
+def _subject_tokens(provider) -> Callable[[str], Tuple[Optional[str], Optional[str]]]:
+    def fetch(sub: str) -> Tuple[Optional[str], Optional[str]]:
         toks = provider.get_tokens_for_subject(sub)
         # Expect attributes access_token / refresh_token
-        access = getattr(toks, "access_token", None)
-        refresh = getattr(toks, "refresh_token", None)
-        if not access:
-            raise RuntimeError("Authenticated, but no Google access token found. Reconnect this connector.")
-        return access, refresh
+        return getattr(toks, "access_token", None), getattr(toks, "refresh_token", None)
+    return fetch
 
+def _resolve_token_fetcher() -> Optional[Callable[[str], Tuple[Optional[str], Optional[str]]]]:
+    # FastMCP sometimes exposes the provider on the server; fall back to ours
+    provider = getattr(mcp, "auth", None) or auth_provider
+    # Known helper name in many 2.x builds
+    if hasattr(provider, "get_tokens_for_subject"):
+        return _subject_tokens(provider)
     # If your build exposes a different helper, add it here:
-    if provider and hasattr(provider, "get_user_tokens"):
-        access, refresh = provider.get_user_tokens(sub)  # hypothetical
-        if not access:
-            raise RuntimeError("Authenticated, but no Google access token found. Reconnect this connector.")
-        return access, refresh
+    if hasattr(provider, "get_user_tokens"):
+        return provider.get_user_tokens  # hypothetical; returns (access, refresh)
+    return None
 
-    # No helper → ask user to add tiny persistence bridge (I can provide snippet)
-    raise RuntimeError(
-        "Auth connected, but this FastMCP build does not expose a token helper.\n"
-        "Option A (recommended): update FastMCP / provider to enable provider-managed tokens.\n"
-        "Option B: add a 10-line auth-success persistence bridge to store (access, refresh) "
-        "per ctx.user['sub'] — I can paste a ready snippet."
-    )
+_TOKEN_FETCHER = _resolve_token_fetcher()
+
+def _get_tokens(ctx: Context) -> Tuple[str, Optional[str]]:
+    sub = _get_user_key(ctx)
+    if _TOKEN_FETCHER is None:
+        # No helper → ask user to add tiny persistence bridge (I can provide snippet)
+        raise RuntimeError(
+            "Auth connected, but this FastMCP build does not expose a token helper.\n"
+            "Option A (recommended): update FastMCP / provider to enable provider-managed tokens.\n"
+            "Option B: add a 10-line auth-success persistence bridge to store (access, refresh) "
+            "per ctx.user['sub'] — I can paste a ready snippet."
+        )
+    access, refresh = _TOKEN_FETCHER(sub)
+    if not access:
+        raise RuntimeError("Authenticated, but no Google access token found. Reconnect this connector.")
+    return access, refresh
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Google Ads client wrapper
@@ -123,6 +184,64 @@ from google.oauth2.credentials import Credentials
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
+# Level 0 is the queried account itself; level 1 its direct clients (if a manager)
+_CUSTOMER_CLIENTS_GAQL = """
+    SELECT
+      customer_client.id,
+      customer_client.descriptive_name
+    FROM customer_client
+    WHERE customer_client.level <= 1
+"""
+
+_LIST_CAMPAIGNS_GAQL = """
+    SELECT
+      campaign.id,
+      campaign.name,
+      campaign.status
+    FROM campaign
+    WHERE campaign.status != 'REMOVED'
+    ORDER BY campaign.id
+"""
+
+_LIST_ALL_CAMPAIGNS_GAQL = """
+    SELECT
+      campaign.id,
+      campaign.name,
+      campaign.status
+    FROM campaign
+    ORDER BY campaign.id
+"""
+
+# Date ranges GAQL has a LAST_<n>_DAYS literal for; anything else uses 30
+_SUMMARY_DAYS = frozenset({7, 14, 30, 90})
+_SUMMARY_GAQL = {
+    d: f"""
+    SELECT
+      metrics.impressions,
+      metrics.clicks,
+      metrics.cost_micros,
+      metrics.conversions
+    FROM customer
+    WHERE segments.date DURING LAST_{d}_DAYS
+"""
+    for d in _SUMMARY_DAYS
+}
+
+# Rows are immutable tuples inside the server (cheap to build, safe to share
+# from the cache) and become dicts only at the tool boundary
+class Account(NamedTuple):
+    id: str
+    name: str
+
+class Campaign(NamedTuple):
+    id: str
+    name: str
+    status: str
+
+# customer_client probes run this many at a time, shared across all users
+_NAME_PROBE_WIDTH = 8
+_NAME_PROBE_POOL = ThreadPoolExecutor(max_workers=_NAME_PROBE_WIDTH, thread_name_prefix="ads-names")
+
 class GoogleAdsService:
     def __init__(self, access_token: str, refresh_token: Optional[str]):
         if not GOOGLE_ADS_DEVELOPER_TOKEN:
@@ -136,83 +255,127 @@ class GoogleAdsService:
             client_secret=GOOGLE_OAUTH_CLIENT_SECRET,
             token_uri="https://oauth2.googleapis.com/token",
         )
-        self.client = GoogleAdsClient(
+        # The provider owns token refresh: its token comes without an expiry, so
+        # google-auth never refreshes it; use_token() swaps in each newer one
+        self.client = self._build_client(None)
+        # One client per login-customer-id and one stub (gRPC channel) per
+        # client and service, all sharing self.credentials
+        self._clients: Dict[Optional[str], GoogleAdsClient] = {None: self.client}
+        self._services: Dict[Tuple[Optional[str], str], object] = {}
+        self._services_lock = threading.Lock()
+        # Sub-account id -> the manager it was listed under, learned from
+        # customer_client; sent as login-customer-id when querying it
+        self._managers: Dict[str, str] = {}
+
+    def _build_client(self, login_customer_id: Optional[str]) -> GoogleAdsClient:
+        # Raw protobuf messages: rows are only read, so skip the proto-plus wrappers
+        return GoogleAdsClient(
             credentials=self.credentials,
             developer_token=GOOGLE_ADS_DEVELOPER_TOKEN,
+            login_customer_id=login_customer_id,
+            use_proto_plus=False,
         )
 
-    def get_accessible_accounts(self) -> List[Dict]:
-        out: List[Dict] = []
+    def _service(self, name: str, customer_id: Optional[str] = None):
+        """Cached service stub for `name`, routed through customer_id's manager if known."""
+        login = self._managers.get(customer_id) if customer_id else None
+        key = (login, name)
+        svc = self._services.get(key)
+        if svc is None:
+            with self._services_lock:
+                svc = self._services.get(key)
+                if svc is None:
+                    client = self._clients.get(login)
+                    if client is None:
+                        client = self._clients[login] = self._build_client(login)
+                    svc = self._services[key] = client.get_service(name)
+        return svc
+
+    def use_token(self, access_token: str) -> None:
+        """Adopt the provider's current access token, keeping the gRPC channels."""
+        if self.credentials.token != access_token:
+            self.credentials.token = access_token
+
+    def get_accessible_accounts(self) -> List[Account]:
         try:
-            customer_service = self.client.get_service("CustomerService")
+            customer_service = self._service("CustomerService")
             rns = customer_service.list_accessible_customers().resource_names
-            for rn in rns:
-                cid = rn.split("/")[-1]
-                ga_service = self.client.get_service("GoogleAdsService")
-                rows = ga_service.search(
-                    customer_id=cid,
-                    query="SELECT customer.descriptive_name FROM customer LIMIT 1",
-                )
-                name = None
-                for row in rows:
-                    name = row.customer.descriptive_name
-                    break
-                out.append({"id": cid, "name": name or cid})
+            cids = [rn.split("/")[-1] for rn in rns]
+            names = self._account_names(cids)
         except GoogleAdsException as ex:
             raise RuntimeError(_fmt_err("get_accessible_accounts", ex))
-        return out
-
-    def list_campaigns(self, customer_id: str) -> List[Dict]:
+        return [Account(cid, names.get(cid) or cid) for cid in cids]
+
+    def _account_names(self, cids: List[str]) -> Dict[str, str]:
+        """id -> descriptive_name for cids. customer_client on an account returns
+        the account itself plus, for a manager, every direct client, so one
+        query per MCC names all of its sub-accounts. Probes go out in parallel
+        waves; ids named by an earlier wave are skipped."""
+        ga_service = self._service("GoogleAdsService")
+
+        def probe(cid: str):
+            return cid, list(ga_service.search(customer_id=cid, query=_CUSTOMER_CLIENTS_GAQL))
+
+        names: Dict[str, str] = {}
+        pending = list(cids)
+        while pending:
+            wave, pending = pending[:_NAME_PROBE_WIDTH], pending[_NAME_PROBE_WIDTH:]
+            for cid, rows in _NAME_PROBE_POOL.map(probe, wave):
+                for row in rows:
+                    client_id = str(row.customer_client.id)
+                    names[client_id] = row.customer_client.descriptive_name
+                    if client_id != cid:
+                        self._managers.setdefault(client_id, cid)
+            pending = [cid for cid in pending if cid not in names]
+        return names
+
+    def list_campaigns(self, customer_id: str, include_removed: bool = False) -> List[Campaign]:
         customer_id = customer_id.replace("-", "")
-        ga_service = self.client.get_service("GoogleAdsService")
-        q = """
-            SELECT
-              campaign.id,
-              campaign.name,
-              campaign.status
-            FROM campaign
-            ORDER BY campaign.id
-        """
+        ga_service = self._service("GoogleAdsService", customer_id)
+        # Removed campaigns are filtered server-side so they're never sent or decoded
+        q = _LIST_ALL_CAMPAIGNS_GAQL if include_removed else _LIST_CAMPAIGNS_GAQL
+        # Raw enum fields are plain ints
+        status_name = self.client.get_type("CampaignStatusEnum").CampaignStatus.Name
         try:
-            rows = ga_service.search(customer_id=customer_id, query=q)
+            # One streamed response instead of a round trip per 10k-row page
+            stream = ga_service.search_stream(customer_id=customer_id, query=q)
             return [
-                {
-                    "id": str(row.campaign.id),
-                    "name": row.campaign.name,
-                    "status": row.campaign.status.name,
-                }
-                for row in rows
+                Campaign(str(row.campaign.id), row.campaign.name, status_name(row.campaign.status))
+                for batch in stream
+                for row in batch.results
             ]
         except GoogleAdsException as ex:
             raise RuntimeError(_fmt_err("list_campaigns", ex))
 
     def get_account_summary(self, customer_id: str, days: int = 30) -> Dict:
         customer_id = customer_id.replace("-", "")
-        ga_service = self.client.get_service("GoogleAdsService")
-        date_window = f"LAST_{days}_DAYS" if days in (7, 14, 30, 90) else "LAST_30_DAYS"
-        q = f"""
-            SELECT
-              metrics.impressions,
-              metrics.clicks,
-              metrics.cost_micros,
-              metrics.conversions
-            FROM customer
-            WHERE segments.date DURING {date_window}
-        """
+        ga_service = self._service("GoogleAdsService", customer_id)
+        q = _SUMMARY_GAQL[days if days in _SUMMARY_DAYS else 30]
         try:
-            rows = ga_service.search(customer_id=customer_id, query=q)
-            summary = {"impressions": 0, "clicks": 0, "cost_micros": 0, "conversions": 0.0}
-            for row in rows:
-                m = row.metrics
-                summary["impressions"] += int(getattr(m, "impressions", 0) or 0)
-                summary["clicks"] += int(getattr(m, "clicks", 0) or 0)
-                summary["cost_micros"] += int(getattr(m, "cost_micros", 0) or 0)
-                cv = getattr(m, "conversions", 0.0) or 0.0
-                try:
-                    summary["conversions"] += float(cv)
-                except Exception:
-                    pass
-            return summary
+            stream = ga_service.search_stream(customer_id=customer_id, query=q)
+            # Metric fields are always set (typed zero defaults), so read them
+            # directly and accumulate in locals
+            imp = clk = cost = 0
+            conv = 0.0
+            for batch in stream:
+                for row in batch.results:
+                    m = row.metrics
+                    imp += m.impressions
+                    clk += m.clicks
+                    cost += m.cost_micros
+                    conv += m.conversions
+            spend = cost / 1e6
+            return {
+                "impressions": imp,
+                "clicks": clk,
+                "cost_micros": cost,
+                "conversions": conv,
+                # Derived here so callers don't need a follow-up computation
+                "cost": spend,
+                "ctr": clk / imp if imp else 0.0,
+                "avg_cpc": spend / clk if clk else 0.0,
+                "cpa": spend / conv if conv else 0.0,
+            }
         except GoogleAdsException as ex:
             raise RuntimeError(_fmt_err("get_account_summary", ex))
 
@@ -222,18 +385,157 @@ def _fmt_err(where: str, ex: GoogleAdsException) -> str:
         parts.append(f"- {err.error_code}: {err.message}")
     return "\n".join(parts)
 
-def _normalize(items: List[Dict]) -> List[Dict]:
-    return items
+def _normalize(items: List[NamedTuple]) -> List[Dict]:
+    return [r._asdict() for r in items]
+
+# One service (Ads client + gRPC channel) per user and grant, reused across tool
+# calls and expiring shortly before the one-hour access-token lifetime.
+_SERVICE_CACHE: TTLCache = TTLCache(maxsize=512, ttl=3300)
+_SERVICE_CACHE_LOCK = threading.Lock()
 
-def _resolve_customer_id(customer_id: Optional[str], ctx: Context, svc: GoogleAdsService) -> str:
+def _get_service(ctx: Context) -> GoogleAdsService:
+    access_token, refresh_token = _get_tokens(ctx)
+    # Keyed by the refresh token when there is one, so the provider handing out
+    # a new access token doesn't throw away the client
+    key = hashlib.sha256(f"{_get_user_key(ctx)}|{refresh_token or access_token}".encode()).hexdigest()
+    with _SERVICE_CACHE_LOCK:
+        svc = _SERVICE_CACHE.get(key)
+    if svc is not None:
+        svc.use_token(access_token)
+        return svc
+    svc = GoogleAdsService(access_token, refresh_token)
+    with _SERVICE_CACHE_LOCK:
+        _SERVICE_CACHE[key] = svc
+    return svc
+
+# Account / campaign lists per user, so repeated tool calls (resolve_account,
+# set_default_account, defaulting the customer id, ...) don't re-hit the API
+_RESPONSE_CACHE: TTLCache = TTLCache(
+    maxsize=int(os.environ.get("CACHE_MAX_SIZE", "1024")),
+    ttl=int(os.environ.get("CACHE_TTL", "300")),
+)
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+def _response_key(ctx: Context, method: str, cid: str = "") -> str:
+    return hashlib.sha256(f"{_get_user_key(ctx)}|{method}|{cid}".encode()).hexdigest()
+
+def _is_cached(key: str) -> bool:
+    with _RESPONSE_CACHE_LOCK:
+        return key in _RESPONSE_CACHE
+
+def _cached_rows(key: str, fetch: Callable[[], List[NamedTuple]]) -> List[NamedTuple]:
+    with _RESPONSE_CACHE_LOCK:
+        rows = _RESPONSE_CACHE.get(key)
+    if rows is None:
+        rows = fetch()
+        with _RESPONSE_CACHE_LOCK:
+            _RESPONSE_CACHE[key] = rows
+    # Rows are immutable; copying the list keeps callers from reordering the cache
+    return list(rows)
+
+def _accessible_accounts(ctx: Context, svc: GoogleAdsService, fresh: bool = False) -> List[Account]:
+    key = _response_key(ctx, "get_accessible_accounts")
+    if fresh:
+        with _RESPONSE_CACHE_LOCK:
+            _RESPONSE_CACHE.pop(key, None)
+            _RESPONSE_CACHE.pop(_response_key(ctx, "account_index"), None)
+    return _cached_rows(key, svc.get_accessible_accounts)
+
+# Above this many accounts resolve_account narrows candidates by trigram first
+_TRIGRAM_MIN_ACCOUNTS = 200
+
+def _trigrams(s: str) -> Set[str]:
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+class _AccountIndex:
+    """Accounts with id/name normalised once, for repeated resolve_account lookups."""
+
+    def __init__(self, accounts: List[Account]):
+        self.entries: List[Tuple[str, str, Account]] = [
+            (a.id.replace("-", ""), (a.name or "").lower(), a) for a in accounts
+        ]
+        self.postings: Optional[Dict[str, Set[int]]] = None
+        if len(self.entries) > _TRIGRAM_MIN_ACCOUNTS:
+            self.postings = {}
+            for i, (aid, name, _) in enumerate(self.entries):
+                # "\0" keeps trigrams from spanning id and name
+                for t in _trigrams(f"{aid}\0{name}"):
+                    self.postings.setdefault(t, set()).add(i)
+
+    def search(self, q: str) -> List[Dict]:
+        entries = self.entries
+        if self.postings is not None and len(q) >= 3:
+            posting_lists = sorted((self.postings.get(t, set()) for t in _trigrams(q)), key=len)
+            candidates = set.intersection(*posting_lists)
+            entries = [self.entries[i] for i in sorted(candidates)]
+        return [a._asdict() for aid, name, a in entries if q in aid or q in name]
+
+def _account_index(ctx: Context, svc: GoogleAdsService) -> _AccountIndex:
+    key = _response_key(ctx, "account_index")
+    with _RESPONSE_CACHE_LOCK:
+        index = _RESPONSE_CACHE.get(key)
+    if index is None:
+        index = _AccountIndex(_accessible_accounts(ctx, svc))
+        with _RESPONSE_CACHE_LOCK:
+            _RESPONSE_CACHE[key] = index
+    return index
+
+# Blocking Google Ads / OAuth calls run in worker threads; the semaphore bounds
+# how many are in flight so a burst of tool calls can't exhaust the pool.
+_ADS_CONCURRENCY = asyncio.Semaphore(int(os.environ.get("ADS_CONCURRENCY", "16")))
+
+async def _run_ads(fn: Callable, *args):
+    async with _ADS_CONCURRENCY:
+        return await asyncio.to_thread(fn, *args)
+
+class TokenBucket:
+    """Allows `rate` calls per second on average, in bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_update = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.last_update) * self.rate)
+                self.last_update = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+# Paces Ads API calls per (user, customer) below the quota, so bursts of tool
+# calls wait briefly here instead of failing with RESOURCE_EXHAUSTED
+_ADS_RATE = int(os.environ.get("ADS_RPM", "60")) / 60
+_ADS_BURST = int(os.environ.get("ADS_BURST", "10"))
+_BUCKETS: LRUCache = LRUCache(maxsize=4096)
+
+async def _throttle(ctx: Context, cid: str = "") -> None:
+    key = (_get_user_key(ctx), cid)
+    bucket = _BUCKETS.get(key)
+    if bucket is None:
+        bucket = _BUCKETS[key] = TokenBucket(_ADS_RATE, _ADS_BURST)
+    await bucket.acquire()
+
+async def _accounts(ctx: Context, svc: GoogleAdsService, fresh: bool = False) -> List[Account]:
+    if fresh or not _is_cached(_response_key(ctx, "get_accessible_accounts")):
+        await _throttle(ctx)
+    return await _run_ads(_accessible_accounts, ctx, svc, fresh)
+
+async def _resolve_customer_id(customer_id: Optional[str], ctx: Context, svc: GoogleAdsService) -> str:
     if customer_id:
         return customer_id.replace("-", "")
-    default_cid = _get_default_customer_id(ctx)
+    default_cid = await _run_ads(_get_default_customer_id, ctx)
     if default_cid:
         return default_cid
-    accts = svc.get_accessible_accounts()
+    accts = await _accounts(ctx, svc)
     if len(accts) == 1:
-        return str(accts[0]["id"]).replace("-", "")
+        return accts[0].id.replace("-", "")
     raise RuntimeError(
         "Multiple accounts found and no default set. "
         "Run resolve_account(name_or_partial) then set_default_account(customer_id), "
@@ -260,59 +562,76 @@ def debug_auth_status(ctx: Context) -> dict:
         return {"error": str(e)}
 
 @mcp.tool()
-def list_accessible_accounts(ctx: Context) -> List[Dict]:
-    access_token, refresh_token = _get_tokens(ctx)
-    svc = GoogleAdsService(access_token, refresh_token)
-    return _normalize(svc.get_accessible_accounts())
-
-@mcp.tool()
-def list_campaigns(ctx: Context, customer_id: Optional[str] = None) -> List[Dict]:
-    access_token, refresh_token = _get_tokens(ctx)
-    svc = GoogleAdsService(access_token, refresh_token)
-    cid = _resolve_customer_id(customer_id, ctx, svc)
-    return _normalize(svc.list_campaigns(cid))
+async def list_accessible_accounts(ctx: Context) -> List[Dict]:
+    svc = await _run_ads(_get_service, ctx)
+    return _normalize(await _accounts(ctx, svc))
 
 @mcp.tool()
-def get_account_summary(ctx: Context, customer_id: Optional[str] = None, days: int = 30) -> Dict:
-    access_token, refresh_token = _get_tokens(ctx)
-    svc = GoogleAdsService(access_token, refresh_token)
-    cid = _resolve_customer_id(customer_id, ctx, svc)
-    return svc.get_account_summary(cid, days)
+async def list_campaigns(
+    ctx: Context, customer_id: Optional[str] = None, include_removed: bool = False
+) -> List[Dict]:
+    svc = await _run_ads(_get_service, ctx)
+    cid = await _resolve_customer_id(customer_id, ctx, svc)
+    method = "list_campaigns_all" if include_removed else "list_campaigns"
+    key = _response_key(ctx, method, cid)
+    if not _is_cached(key):
+        await _throttle(ctx, cid)
+    rows = await _run_ads(_cached_rows, key, lambda: svc.list_campaigns(cid, include_removed))
+    return _normalize(rows)
 
 @mcp.tool()
-def resolve_account(ctx: Context, query: str) -> Dict:
-    access_token, refresh_token = _get_tokens(ctx)
-    svc = GoogleAdsService(access_token, refresh_token)
-    accts = svc.get_accessible_accounts()
-    q = query.replace("-", "").strip().lower()
-    matches = []
-    for a in accts:
-        aid = str(a.get("id", "")).replace("-", "")
-        name = (a.get("name") or "").lower()
-        if q in aid or q in name:
-            matches.append(a)
+async def get_account_summary(ctx: Context, customer_id: Optional[str] = None, days: int = 30) -> Dict:
+    svc = await _run_ads(_get_service, ctx)
+    cid = await _resolve_customer_id(customer_id, ctx, svc)
+    await _throttle(ctx, cid)
+    return await _run_ads(svc.get_account_summary, cid, days)
+
+async def _match_accounts(ctx: Context, svc: GoogleAdsService, query: str) -> List[Dict]:
+    await _accounts(ctx, svc)  # fetch (rate-limited) if the list isn't cached
+    index = await _run_ads(_account_index, ctx, svc)
+    matches = index.search(query.replace("-", "").strip().lower())
     if not matches:
         raise RuntimeError(f"No account matched '{query}'.")
+    return matches
+
+@mcp.tool()
+async def resolve_account(ctx: Context, query: str) -> Dict:
+    svc = await _run_ads(_get_service, ctx)
+    matches = await _match_accounts(ctx, svc, query)
     if len(matches) > 1:
         return {"ambiguous": True, "candidates": matches[:6]}
     m = matches[0]
     return {"customer_id": str(m["id"]), "name": m.get("name")}
 
 @mcp.tool()
-def set_default_account(ctx: Context, customer_id: str) -> Dict:
-    access_token, refresh_token = _get_tokens(ctx)
-    svc = GoogleAdsService(access_token, refresh_token)
-    ids = {str(a["id"]).replace("-", "") for a in svc.get_accessible_accounts()}
+async def set_default_account(ctx: Context, customer_id: str) -> Dict:
+    svc = await _run_ads(_get_service, ctx)
     cid = customer_id.replace("-", "")
+    ids = {a.id.replace("-", "") for a in await _accounts(ctx, svc)}
+    if cid not in ids:
+        # Maybe granted since the list was cached: re-fetch once before refusing
+        accts = await _accounts(ctx, svc, fresh=True)
+        ids = {a.id.replace("-", "") for a in accts}
     if cid not in ids:
         raise RuntimeError(f"Account {customer_id} is not in your accessible list.")
-    _set_default_customer_id(ctx, cid)
+    await _run_ads(_set_default_customer_id, ctx, cid)
     return {"ok": True, "default_customer_id": cid}
 
+@mcp.tool()
+async def resolve_and_set_default(ctx: Context, query: str) -> Dict:
+    """Resolve an account by name or id and make it the default in one call."""
+    svc = await _run_ads(_get_service, ctx)
+    matches = await _match_accounts(ctx, svc, query)
+    if len(matches) > 1:
+        return {"ambiguous": True, "candidates": matches[:6]}
+    m = matches[0]
+    cid = str(m["id"]).replace("-", "")
+    await _run_ads(_set_default_customer_id, ctx, cid)
+    return {"ok": True, "default_customer_id": cid, "name": m.get("name")}
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Run (SSE for Claude)
 # ─────────────────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
-    import os
     port = int(os.environ.get("PORT", 8000))
     mcp.run(transport="sse", host="0.0.0.0", port=port)